@@ -1,10 +1,33 @@
 import streamlit as st
-import pandas as pd
 from data.table_data import get_table_data, get_table_type
 from components.selectable_table import create_selectable_table
 from components.summary_table import create_summary_table
 from components.matrix_table import create_matrix_table
 from components.matrix_utils import display_matrix_selected_values
+from components.save_assessment import create_save_assessment_form
+from components.improvement import create_improvement_panel
+from components.monte_carlo import create_monte_carlo_panel
+from components.what_if import create_what_if_panel
+from components.derived import render_graph_inspector
+from components.navigation import select_section
+from components.session import get_selection, restore_selection
+from components.profiling import profile_section, render_profiling_sidebar
+from components.styles import emit_stylesheets
+from components.table_model import Table
+from config import NAVIGATION, PRECOMPUTE_LOOKUP, PROFILE, RENDERER
+
+if PRECOMPUTE_LOOKUP:
+    # Build the shared lookup table once per process, before the first save or
+    # Monte Carlo run needs it; the summary tables are scored by the credibility graph
+    from scoring.lookup import get_lookup_table
+    get_lookup_table()
+
+# Matrix sections: table id -> (title, table type)
+MATRIX_SECTIONS = {
+    "table2": ("Table 2: Design Solution vs M&S Credibility Matrix", "matrix_numeric"),
+    "table3": ("Table 3: Decision Consequence vs Simulation Influence Matrix", "matrix_color"),
+    "table4": ("Table 4: Risk Assessment Categories", "matrix_text"),
+}
 
 def run_dashboard():
     """Main function to run the Streamlit dashboard"""
@@ -13,21 +36,26 @@ def run_dashboard():
     st.title("Credibility Assessment Dashboard")
     st.markdown("---")
     
-    # Initialize session state for selected cells if not exists
-    if 'selected_cells' not in st.session_state:
-        st.session_state.selected_cells = {}
-    
-    # Table 1: Detailed Credibility Assessment Criteria
-    st.subheader("Table 1: Credibility Assessment Criteria")
-    st.markdown("*Click on cells to select them (one per column)*")
-    
-    table1_data = get_table_data("table1")
-    df = pd.DataFrame(table1_data)
-    create_selectable_table(df, "table1")
-    update_summary_tables_from_selections(df, "table1")  # Update summary tables based on selections
-    #display_selected_values(df, "table1")
+    # Load the packed selection state (from the URL or state backend if configured)
+    with profile_section("restore_selection"):
+        restore_selection()
+    
+    # Shared styles of the native renderers, emitted once per full run
+    if RENDERER == "native":
+        emit_stylesheets()
+    
+    # Only the chosen section is built; the others keep their state in the session
+    if NAVIGATION == "sections":
+        section = select_section()
+        if section == "assessment":
+            render_assessment_section()
+        else:
+            render_matrix_section(section, *MATRIX_SECTIONS[section])
+        render_developer_sidebar()
+        return
     
-    create_summary_table(df, "summary_table1")
+    # Each section is a fragment: a click only reruns the section it belongs to
+    render_assessment_section()
     
     # Calculate button
     # st.markdown("---")
@@ -37,84 +65,79 @@ def run_dashboard():
     st.markdown("---")
     
     # Table 2: Design Solution vs M&S Credibility Matrix
-    st.subheader("Table 2: Design Solution vs M&S Credibility Matrix")
-    st.markdown("*Click on a cell to select it*")
-    
-    table2_data = get_table_data("table2")
-    create_matrix_table(table2_data, "table2", "matrix_numeric")
-    
-    st.markdown("### Selected Values:")
-    display_matrix_selected_values(table2_data, "table2", "matrix_numeric")
+    render_matrix_section("table2", *MATRIX_SECTIONS["table2"])
     
     st.markdown("---")
     
     # Table 3: Decision Consequence vs Simulation Influence Matrix
-    st.subheader("Table 3: Decision Consequence vs Simulation Influence Matrix")
-    st.markdown("*Click on a cell to select it*")
-    
-    table3_data = get_table_data("table3")
-    create_matrix_table(table3_data, "table3", "matrix_color")
-    
-    st.markdown("### Selected Values:")
-    display_matrix_selected_values(table3_data, "table3", "matrix_color")
+    render_matrix_section("table3", *MATRIX_SECTIONS["table3"])
     
     st.markdown("---")
     
     # Table 4: Risk Assessment Matrix
-    st.subheader("Table 4: Risk Assessment Categories")
-    st.markdown("*Click on a cell to select it*")
+    render_matrix_section("table4", *MATRIX_SECTIONS["table4"])
+    
+    render_developer_sidebar()
+
+def render_developer_sidebar():
+    """Developer sidebar with the render time of each section and the derived values"""
+    if PROFILE:
+        render_profiling_sidebar()
+        render_graph_inspector()
+
+@st.fragment
+def render_assessment_section():
+    """Render Table 1 and the summary tables that depend on it"""
+    # A Table 1 click moved the auto-filled Table 2 cell: rerun the whole app to show it
+    # (not needed when only this section is shown)
+    if st.session_state.pop('table2_autofilled', False) and NAVIGATION == "all":
+        st.rerun()
+    
+    st.subheader("Table 1: Credibility Assessment Criteria")
+    st.markdown("*Click on cells to select them (one per column)*")
     
-    table4_data = get_table_data("table4")
-    create_matrix_table(table4_data, "table4", "matrix_text")
+    with profile_section("get_table_data[table1]"):
+        table1_data = get_table_data("table1")
+    table1 = Table.from_columns(table1_data)
+    with profile_section("create_selectable_table[table1]"):
+        create_selectable_table(table1, "table1")
+    #display_selected_values(table1, "table1")
+    
+    with profile_section("create_summary_table"):
+        create_summary_table(table1, "summary_table1")
+    with profile_section("create_what_if_panel"):
+        create_what_if_panel()
+    with profile_section("create_improvement_panel"):
+        create_improvement_panel()
+    with profile_section("create_monte_carlo_panel"):
+        create_monte_carlo_panel()
+    create_save_assessment_form()
 
+@st.fragment
+def render_matrix_section(table_id, title, table_type):
+    """Render one matrix table with its selected values"""
+    st.subheader(title)
+    st.markdown("*Click on a cell to select it*")
+    
+    with profile_section(f"get_table_data[{table_id}]"):
+        table_data = get_table_data(table_id)
+    with profile_section(f"create_matrix_table[{table_id}]"):
+        create_matrix_table(table_data, table_id, table_type)
+    
     st.markdown("### Selected Values:")
-    display_matrix_selected_values(table4_data, "table4", "matrix_text")
+    display_matrix_selected_values(table_data, table_id, table_type)
     
 
-def display_selected_values(df, table_id):
+def display_selected_values(table, table_id):
     """Display the currently selected values for Table 1"""
     st.markdown("### Selected Values:")
-    if st.session_state.selected_cells.get(table_id):
-        for col, row_idx in st.session_state.selected_cells[table_id].items():
+    selected_rows = get_selection().to_selected_cells()[table_id]
+    if any(row_idx is not None for row_idx in selected_rows.values()):
+        for col, row_idx in selected_rows.items():
             if row_idx is not None:
-                value = df.iloc[row_idx][col]
-                metric_value = df.iloc[row_idx]['Metrics']
+                value = table.cell(row_idx, col)
+                metric_value = table.cell(row_idx, 'Metrics')
                 display_text = f"**{col}**: Row {metric_value} - {value[:50]}..." if len(str(value)) > 50 else f"**{col}**: Row {metric_value} - {value}"
                 st.write(display_text)
     else:
         st.write("No cells selected yet.")
-
-def update_summary_tables_from_selections(df, table_id):
-    """Update summary tables based on selected cells in the selectable table"""
-    if table_id not in st.session_state.selected_cells:
-        return
-    
-    # Initialize summary data in session state if not exists
-    if 'summary_data' not in st.session_state:
-        st.session_state.summary_data = {
-            'development': {'Data Pedigree': '', 'Validation': '', 'Code Readiness': '', 'Models': ''},
-            'use': {'Input Pedigree': '', 'Uncertainty': '', 'Sensitivity': ''},
-            'support': {'History': '', 'Process': ''}
-        }
-    
-    # Column mapping from selectable table to summary tables
-    column_mapping = {
-        'Data Pedigree': ('development', 'Data Pedigree'),
-        'Validation': ('development', 'Validation'),
-        'Code readiness only for in house software': ('development', 'Code Readiness'),
-        'Models': ('development', 'Models'),
-        'Input pedigree': ('use', 'Input Pedigree'),
-        'Uncertainty': ('use', 'Uncertainty'),
-        'Sensitivity': ('use', 'Sensitivity'),
-        'History': ('support', 'History'),
-        'Process development': ('support', 'Process')
-    }
-    
-    # Update summary data based on selections
-    selections = st.session_state.selected_cells[table_id]
-    for col, row_idx in selections.items():
-        if row_idx is not None and col in column_mapping:
-            table_name, summary_col = column_mapping[col]
-            # Get the actual metric value from the dataframe
-            metric_value = df.iloc[row_idx]['Metrics']
-            st.session_state.summary_data[table_name][summary_col] = str(metric_value)
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""
+Score large assessment exports from the command line.
+
+Streams a CSV or JSON Lines file in chunks, scores every chunk with the same
+rules as the dashboard summary tables and writes the results incrementally,
+so memory stays bounded whatever the input size. Chunks can be scored by a
+process pool; output rows always keep the input order.
+
+Factor columns are matched by their Table 1 name (e.g. "Data Pedigree") or
+their field name (e.g. "data_pedigree") and hold the metric 1, 2 or 3
+(whole-number floats such as 3.0 are accepted); an empty or missing value
+means the factor is not selected. Input records are copied to the output
+unchanged, followed by the result columns. A record with any other metric
+value is not scored: its result columns stay empty and the ``error`` column
+names the invalid factors, and the command exits with status 1.
+
+    python batch_score.py assessments.csv scores.csv --workers 8
+    python batch_score.py assessments.jsonl - --format jsonl
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+from scoring.batch import PHASE_TABLE_TYPES, UNRANKED, BatchResult, invalid_metrics, score_batch
+from scoring.engine import FACTOR_COLUMNS, LEVEL_CATEGORIES, Assessment
+from scoring.lookup import TABLE_SIZE, encode_batch, get_lookup_table
+
+# Accepted input names of each factor, in FACTOR_COLUMNS order (the Table 1 name wins
+# when a record has both)
+FACTOR_ALIASES = [
+    (column, field.name)
+    for column, field in zip(FACTOR_COLUMNS, fields(Assessment))
+]
+
+RESULT_COLUMNS = [
+    f"{phase}_{suffix}"
+    for phase, _ in PHASE_TABLE_TYPES
+    for suffix in ('score', 'level', 'category')
+] + ['error']
+
+def _factor_index(keys):
+    """Map each factor (in FACTOR_COLUMNS order) to its input key, None when absent"""
+    return [next((key for key in keys if key in aliases), None) for aliases in FACTOR_ALIASES]
+
+def _parse_metrics(columns):
+    """
+    Convert factor columns of raw values into an (N x 9) metrics array
+
+    Values are validated like scoring.batch.as_metrics_array: whole numbers
+    between 0 and 3, with None and empty text for unselected factors.
+
+    Args:
+        columns (list): Per factor, a sequence of raw values (None when the factor is absent)
+
+    Returns:
+        tuple: int8 metrics (0 in rows with an error) and per row an error message or None
+    """
+    size = max((len(values) for values in columns if values is not None), default=0)
+    array = np.full((size, len(FACTOR_COLUMNS)), np.nan)
+    unparsed = np.zeros(array.shape, dtype=bool)
+    for idx, values in enumerate(columns):
+        if values is not None:
+            array[:, idx], unparsed[:, idx] = _parse_column(values)
+    invalid = unparsed | invalid_metrics(array)
+
+    errors = [None] * size
+    for row_idx in np.flatnonzero(invalid.any(axis=1)).tolist():
+        errors[row_idx] = "; ".join(
+            f"{FACTOR_COLUMNS[idx]}: invalid metric {columns[idx][row_idx]!r}"
+            for idx in np.flatnonzero(invalid[row_idx]).tolist()
+        )
+    array[invalid.any(axis=1)] = 0
+    return np.nan_to_num(array, nan=0.0).astype(np.int8), errors
+
+# Common metric texts, matched with vectorized comparisons before any float parsing
+_METRIC_TEXTS = {'': np.nan, '0': 0, '1': 1, '2': 2, '3': 3, '1.0': 1, '2.0': 2, '3.0': 3}
+
+def _parse_column(values):
+    """Raw values of one factor as floats (NaN when empty) and a mask of unparsable values"""
+    text = np.char.strip(np.array(['' if value is None else str(value) for value in values], dtype=str))
+    parsed = np.full(len(text), np.nan)
+    matched = np.zeros(len(text), dtype=bool)
+    for metric_text, metric in _METRIC_TEXTS.items():
+        hits = text == metric_text
+        parsed[hits] = metric
+        matched |= hits
+    unparsed = np.zeros(len(text), dtype=bool)
+    for row_idx in np.flatnonzero(~matched).tolist():
+        try:
+            if isinstance(values[row_idx], bool):
+                raise ValueError(values[row_idx])
+            parsed[row_idx] = float(text[row_idx])
+        except ValueError:
+            unparsed[row_idx] = True
+    return parsed, unparsed
+
+def _result_values(result):
+    """Turn a BatchResult into one list of RESULT_COLUMNS values per row"""
+    columns = []
+    for phase, table_type in PHASE_TABLE_TYPES:
+        scores = getattr(result, f"{phase}_score")
+        levels = getattr(result, f"{phase}_level")
+        categories = LEVEL_CATEGORIES[table_type]
+        columns.append([None if np.isnan(score) else float(score) for score in scores])
+        columns.append([None if level == UNRANKED else int(level) for level in levels])
+        columns.append([categories.get(int(level), '') for level in levels])
+    columns.append([None] * len(result.has_code_readiness))  # error
+    return [list(values) for values in zip(*columns)]
+
+@lru_cache(maxsize=1)
+def _results_by_code():
+    """Result values of every complete selection, built once per process"""
+    table = get_lookup_table()
+    columns = {}
+    for idx, (phase, _) in enumerate(PHASE_TABLE_TYPES):
+        columns[f"{phase}_score"] = table.scores[:, idx]
+        columns[f"{phase}_level"] = table.levels[:, idx]
+    has_code = np.zeros(TABLE_SIZE, dtype=bool)
+    return _result_values(BatchResult(has_code_readiness=has_code, **columns))
+
+def _score_metrics(metrics, errors):
+    """Result values per row: precomputed for complete selections, scored otherwise"""
+    codes = encode_batch(metrics)
+    by_code = _results_by_code()
+    results = [by_code[code] if code >= 0 else None for code in codes.tolist()]
+    incomplete = np.flatnonzero(codes < 0)
+    if len(incomplete):
+        for row_idx, values in zip(incomplete, _result_values(score_batch(metrics[incomplete]))):
+            results[row_idx] = values
+    for row_idx, error in enumerate(errors):
+        if error is not None:
+            results[row_idx] = _error_values(error)
+    return results
+
+def _error_values(error):
+    """Result values of a record that could not be scored"""
+    return [None] * (len(RESULT_COLUMNS) - 1) + [error]
+
+@lru_cache(maxsize=1)
+def _csv_suffixes():
+    """CSV text of the result columns of every complete selection"""
+    return [_csv_text(values) for values in _results_by_code()]
+
+def _csv_text(values):
+    output = io.StringIO()
+    csv.writer(output, lineterminator='').writerow(['' if value is None else value for value in values])
+    return output.getvalue()
+
+def score_csv_chunk(header, records):
+    """
+    Score a chunk of raw CSV records
+
+    Args:
+        header (list): Parsed header row
+        records (list): Raw record strings (a quoted field may span lines)
+
+    Returns:
+        tuple: The records followed by their result columns, as CSV text, and
+            the number of records with invalid metrics
+    """
+    rows = list(csv.reader(records))
+    positions = [None if key is None else header.index(key) for key in _factor_index(header)]
+    columns = [
+        None if pos is None else [row[pos] if pos < len(row) else '' for row in rows]
+        for pos in positions
+    ]
+    metrics, errors = _parse_metrics(columns)
+    codes = encode_batch(metrics)
+    suffixes = _csv_suffixes()
+
+    lines = []
+    results = None
+    for row_idx, (record, row, code, error) in enumerate(zip(records, rows, codes.tolist(), errors)):
+        if code >= 0 and error is None:
+            suffix = suffixes[code]
+        else:
+            results = results or _score_metrics(metrics, errors)
+            suffix = _csv_text(results[row_idx])
+        padding = ',' * max(len(header) - len(row), 0)
+        lines.append(record.rstrip('\r\n') + padding + ',' + suffix + '\n')
+    return ''.join(lines), len(errors) - errors.count(None)
+
+def score_jsonl_chunk(lines):
+    """
+    Score a chunk of JSON Lines
+
+    Returns:
+        tuple: The records with their result columns, as JSON Lines text, and
+            the number of records with invalid metrics
+    """
+    records = [json.loads(line) for line in lines if line.strip()]
+    # Factor names are resolved per record: records of one file may use different aliases
+    columns = [
+        [next((record[alias] for alias in aliases if alias in record), None) for record in records]
+        for aliases in FACTOR_ALIASES
+    ]
+    metrics, errors = _parse_metrics(columns)
+    results = _score_metrics(metrics, errors)
+    text = ''.join(
+        json.dumps({**record, **dict(zip(RESULT_COLUMNS, values))}) + '\n'
+        for record, values in zip(records, results)
+    )
+    return text, len(errors) - errors.count(None)
+
+def csv_records(lines):
+    """Group lines into CSV records, joining lines inside quoted fields"""
+    pending = []
+    quotes = 0
+    for line in lines:
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield ''.join(pending)
+            pending = []
+            quotes = 0
+    if pending:
+        yield ''.join(pending)
+
+def _chunks(iterable, size):
+    """Yield lists of up to size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _run_ordered(function, chunk_args, workers, write):
+    """
+    Apply function to every argument tuple and write results in input order
+
+    At most 2 * workers chunks are in flight, which bounds memory use.
+
+    Returns:
+        int: Total number of invalid records reported by the chunks
+    """
+    invalid = 0
+    if workers <= 1:
+        for args in chunk_args:
+            text, errors = function(*args)
+            write(text)
+            invalid += errors
+        return invalid
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in chunk_args:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= 2 * workers:
+                text, errors = pending.popleft().result()
+                write(text)
+                invalid += errors
+        while pending:
+            text, errors = pending.popleft().result()
+            write(text)
+            invalid += errors
+    return invalid
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if path.endswith('.csv'):
+        return 'csv'
+    raise SystemExit(f"Cannot tell the format of '{path}', pass --format csv or --format jsonl")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score credibility assessments in bulk")
+    parser.add_argument('input', help="Input CSV/JSON Lines file, '-' for stdin")
+    parser.add_argument('output', help="Output file, '-' for stdout")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input/output format (default: from extension)")
+    parser.add_argument('--chunk-size', type=int, default=50_000, help="Rows per chunk (default: 50000)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: number of CPUs, 1 disables the pool)")
+    args = parser.parse_args(argv)
+
+    fmt = _detect_format(args.input if args.input != '-' else args.output, args.format)
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+
+    try:
+        if fmt == 'csv':
+            records = csv_records(source)
+            header_record = next(records, None)
+            if header_record is None:
+                return
+            header = next(csv.reader([header_record]))
+            target.write(header_record.rstrip('\r\n') + ',' + ','.join(RESULT_COLUMNS) + '\n')
+            chunk_args = ((header, chunk) for chunk in _chunks(records, args.chunk_size))
+            invalid = _run_ordered(score_csv_chunk, chunk_args, args.workers, target.write)
+        else:
+            chunk_args = ((lines,) for lines in _chunks(source, args.chunk_size))
+            invalid = _run_ordered(score_jsonl_chunk, chunk_args, args.workers, target.write)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    if invalid:
+        print(f"{invalid} records with invalid metrics were not scored, see the error column",
+              file=sys.stderr)
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Measure the markdown/HTML bytes the dashboard emits per rerun.
+
+Runs main.py headlessly with Streamlit's AppTest and reports the bytes of
+all markdown elements of a full run, of its <style> blocks, and of each
+dashboard section (Table 1 with the summary, and the three matrices). The
+section totals are compared with the "html_bytes" entry of
+benchmarks/baseline.json: a section emitting more bytes than its baseline
+fails the run.
+
+    python benchmarks/html_bytes.py                       # native renderer
+    python benchmarks/html_bytes.py --renderer component
+    python benchmarks/html_bytes.py --update              # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# Section of the elements following a subheader starting with this prefix
+SECTION_HEADINGS = {
+    'Table 2:': 'table2',
+    'Table 3:': 'table3',
+    'Table 4:': 'table4',
+}
+
+
+def markdown_bytes(elements):
+    """Total UTF-8 size of the markdown elements"""
+    return sum(len(element.value.encode('utf-8')) for element in elements)
+
+
+def _is_style(element):
+    return element.value.lstrip().startswith('<style>')
+
+
+def section_markdown(node, sections=None, current='assessment'):
+    """
+    Group the markdown elements of an AppTest element tree by dashboard section
+
+    Returns:
+        tuple: (dict of section -> markdown elements in render order, section of the last element)
+    """
+    sections = {'assessment': []} if sections is None else sections
+    element_type = getattr(node, 'type', None)
+    if element_type == 'subheader':
+        current = next((section for prefix, section in SECTION_HEADINGS.items()
+                        if node.value.startswith(prefix)), current)
+    elif element_type == 'markdown':
+        sections.setdefault(current, []).append(node)
+    children = getattr(node, 'children', None) or {}
+    if isinstance(children, dict):
+        children = children.values()
+    for child in children:
+        sections, current = section_markdown(child, sections, current)
+    return sections, current
+
+
+def measure(renderer):
+    """
+    Run the dashboard once and measure its markdown bytes
+
+    Returns:
+        dict: Totals ('elements', 'bytes', 'style_bytes') and 'sections' (section -> bytes)
+    """
+    os.environ['CREDIBILITY_RENDERER'] = renderer
+    sys.path.insert(0, str(ROOT))
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / 'main.py'), default_timeout=60)
+    app.run()
+    if app.exception:
+        raise SystemExit(f"Dashboard raised: {app.exception}")
+
+    markdown = list(app.markdown)
+    sections, _ = section_markdown(app._tree)
+    return {
+        'elements': len(markdown),
+        'bytes': markdown_bytes(markdown),
+        'style_bytes': markdown_bytes([element for element in markdown if _is_style(element)]),
+        'sections': {section: markdown_bytes(elements) for section, elements in sections.items()},
+    }
+
+
+def compare(result, baseline):
+    """
+    Compare the section bytes with the baseline of the same renderer
+
+    Returns:
+        list: Human readable regressions (empty when none)
+    """
+    if not baseline:
+        return ["no baseline, rerun with --update"]
+    regressions = []
+    for section, size in result['sections'].items():
+        expected = baseline.get(section)
+        if expected is None:
+            regressions.append(f"{section}: no baseline, rerun with --update")
+        elif size > expected:
+            regressions.append(f"{section}: {size} markdown bytes > {expected}")
+    return regressions
+
+
+def _report(result, renderer, baseline):
+    print(f"renderer:            {renderer}")
+    print(f"markdown elements:   {result['elements']}")
+    print(f"markdown bytes:      {result['bytes']}")
+    print(f"  of which <style>:  {result['style_bytes']}")
+    print(f"{'section':<12} {'md bytes':>9} {'baseline':>9}")
+    for section, size in result['sections'].items():
+        expected = baseline.get(section)
+        print(f"{section:<12} {size:>9} {'-' if expected is None else expected:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dashboard markdown bytes per section")
+    parser.add_argument('--renderer', choices=['native', 'component'], default='native')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--update', action='store_true', help="Store the section bytes as the new baseline")
+    args = parser.parse_args(argv)
+
+    result = measure(args.renderer)
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    html_baselines = baselines.setdefault('html_bytes', {})
+    _report(result, args.renderer, html_baselines.get(args.renderer, {}))
+
+    if args.update:
+        html_baselines[args.renderer] = result['sections']
+        args.baseline.write_text(json.dumps(baselines, indent=2) + '\n')
+        print(f"Section baseline for '{args.renderer}' written to {args.baseline}")
+        return
+
+    regressions = compare(result, html_baselines.get(args.renderer, {}))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        raise SystemExit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Load generator for the HTTP scoring service.
+
+Keeps a number of concurrent keep-alive connections busy with random
+single-assessment ``POST /score`` requests for a fixed duration and reports
+the p50/p99 latency, the requests per second and the mean batch size the
+service formed from them.
+
+    python benchmarks/loadgen.py --spawn                        # start a local service
+    python benchmarks/loadgen.py --url http://127.0.0.1:8502 --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+FACTOR_COUNT = 9
+CODE_READINESS = 2
+
+
+def random_metrics(rng):
+    """Nine random metrics, code readiness left out in a quarter of the assessments"""
+    metrics = [rng.randint(1, 3) for _ in range(FACTOR_COUNT)]
+    if rng.random() < 0.25:
+        metrics[CODE_READINESS] = None
+    return metrics
+
+
+async def _request(reader, writer, host, method, path, payload=None):
+    """Send one request on an open connection and return (status, decoded JSON body)"""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _worker(host, port, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, 'POST', '/score',
+                                       {'metrics': random_metrics(rng)})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await _request(reader, writer, host, 'GET', '/stats'))[1]
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, duration):
+    """
+    Run the load and collect the measurements
+
+    Returns:
+        dict: Latency percentiles (ms), requests per second, errors and batching counters
+    """
+    before = await _stats(host, port)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(host, port, start + duration, latencies, errors, seed)
+        for seed in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    after = await _stats(host, port)
+
+    latencies.sort()
+    batches = after['batches'] - before['batches']
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0,
+        'mean_batch_size': (after['scored'] - before['scored']) / batches if batches else 0.0,
+    }
+
+
+def _spawn_service(port, extra_args):
+    """Start scoring_service.py on a port and wait until it listens"""
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / 'scoring_service.py'), '--port', str(port), *extra_args],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    if 'listening' not in line:
+        process.kill()
+        raise SystemExit("The scoring service did not start")
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the HTTP scoring service")
+    parser.add_argument('--url', default='http://127.0.0.1:8502', help="Service to load")
+    parser.add_argument('--spawn', action='store_true', help="Start a local service on the URL's port")
+    parser.add_argument('--concurrency', type=int, default=32, help="Concurrent connections (default: 32)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds of load (default: 5)")
+    parser.add_argument('--service-args', default='', help="Extra arguments for a spawned service, "
+                                                           "e.g. '--batch-delay-ms 1'")
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or '127.0.0.1', url.port or 80
+    process = _spawn_service(port, args.service_args.split()) if args.spawn else None
+    try:
+        result = asyncio.run(run_load(host, port, args.concurrency, args.duration))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"requests         {result['requests']} ({result['errors']} errors)")
+    print(f"requests/s       {result['rps']:.0f}")
+    print(f"latency p50      {result['p50_ms']:.2f} ms")
+    print(f"latency p99      {result['p99_ms']:.2f} ms")
+    print(f"mean batch size  {result['mean_batch_size']:.1f}")
+    if result['errors']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Rerun latency and element count benchmarks of the dashboard.
+
+Drives main.py headlessly with Streamlit's AppTest through scripted click
+sequences across Table 1 and the three matrices. For every rerun it records
+the wall time, the number of elements emitted and the bytes of markdown/HTML
+produced, and compares them with benchmarks/baseline.json: more elements or
+more bytes in any rerun, or a clearly slower initial run or median rerun of
+a scenario than the baseline fails the run.
+
+    python benchmarks/rerun_suite.py                      # native renderer
+    python benchmarks/rerun_suite.py --renderer component
+    python benchmarks/rerun_suite.py --update             # record a new baseline
+
+The renderer is read at import, so each run measures one renderer. AppTest
+cannot click the component renderer's grids, so the suite sends the click
+event the grid front end sends (row, column and a sequence number) as the
+component's widget value. Its on_change callback then runs the same toggle,
+Table 2 autofill and rerun code as a native button click.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# Click sequences: ('factor', Table 1 column, row index) or ('matrix', table id, row, col)
+SCENARIOS = {
+    'full_assessment': [
+        ('factor', 'Data Pedigree', 2),
+        ('factor', 'Validation', 1),
+        ('factor', 'Code readiness only for in house software', 0),
+        ('factor', 'Models', 2),
+        ('factor', 'Input pedigree', 1),
+        ('factor', 'Uncertainty', 2),
+        ('factor', 'Sensitivity', 0),
+        ('factor', 'History', 2),
+        ('factor', 'Process development', 1),
+    ],
+    'matrices': [
+        ('matrix', 'table2', 1, 2),
+        ('matrix', 'table3', 0, 3),
+        ('matrix', 'table4', 2, 1),
+        ('matrix', 'table2', 3, 0),
+        ('matrix', 'table3', 0, 3),
+    ],
+    'revise_factor': [
+        ('factor', 'Models', 0),
+        ('factor', 'Models', 2),
+        ('factor', 'Models', 2),
+        ('factor', 'History', 1),
+    ],
+}
+
+
+def count_elements(node):
+    """Number of nodes in an AppTest element tree"""
+    children = getattr(node, 'children', None) or {}
+    if isinstance(children, dict):
+        children = children.values()
+    return 1 + sum(count_elements(child) for child in children)
+
+
+def markdown_bytes(app):
+    """UTF-8 size of all markdown/HTML elements of the last run"""
+    return sum(len(element.value.encode('utf-8')) for element in app.markdown)
+
+
+def _native_key(step):
+    kind, table_id = step[0], step[1]
+    if kind == 'factor':
+        return f"table1_{table_id}_{step[2]}"
+    prefix = 'color_' if table_id == 'table3' else ''
+    return f"{prefix}{table_id}_{step[2]}_{step[3]}"
+
+
+def _find_grid(node, key):
+    """The selection grid component element with the given widget key, or None"""
+    if getattr(node, 'type', None) == 'component_instance' and getattr(node, 'key', None) == key:
+        return node
+    children = getattr(node, 'children', None) or {}
+    if isinstance(children, dict):
+        children = children.values()
+    for child in children:
+        found = _find_grid(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _click(app, step, renderer, seq):
+    """
+    Apply one scripted click before the next rerun
+
+    Returns:
+        WidgetStates or None: Widget states carrying the grid click (component
+            renderer), None when the click was registered on a native button
+    """
+    if renderer == 'native':
+        app.button(key=_native_key(step)).click()
+        return None
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    table_id = 'table1' if step[0] == 'factor' else step[1]
+    grid = _find_grid(app._tree, f"{table_id}_grid")
+    if grid is None:
+        raise SystemExit(f"No selection grid for {table_id} in the last run")
+    if step[0] == 'factor':
+        _, column, row_idx = step
+        col_idx = json.loads(json.loads(grid.proto.json_args)['payload'])['columns'].index(column)
+    else:
+        _, _, row_idx, col_idx = step
+    widget_states = app._tree.get_widget_states()
+    widget_states.widgets.append(WidgetState(
+        id=grid.proto.id,
+        json_value=json.dumps({'row': row_idx, 'col': col_idx, 'seq': f"bench-{seq}"}),
+    ))
+    return widget_states
+
+
+def _measure(app, widget_states=None):
+    start = time.perf_counter()
+    if widget_states is None:
+        app.run()
+    else:
+        app._run(widget_states)
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        raise SystemExit(f"Dashboard raised: {app.exception}")
+    return {
+        'time_ms': elapsed * 1000,
+        'elements': count_elements(app._tree),
+        'markdown_bytes': markdown_bytes(app),
+    }
+
+
+def run_scenario(steps, renderer):
+    """Initial run followed by one rerun per click; one measurement dict per run"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / 'main.py'), default_timeout=60)
+    results = [_measure(app)]
+    for seq, step in enumerate(steps):
+        results.append(_measure(app, _click(app, step, renderer, seq)))
+    return results
+
+
+def run_suite(renderer, repeats):
+    """
+    Run every scenario repeats times
+
+    Returns:
+        dict: Scenario -> list of per-run measurements (median time over the repeats)
+    """
+    # Warm-up run: imports and table loading should not count against the first scenario
+    run_scenario([], renderer)
+    suite = {}
+    for name, steps in SCENARIOS.items():
+        runs = [run_scenario(steps, renderer) for _ in range(repeats)]
+        suite[name] = [
+            {**runs[-1][idx], 'time_ms': round(statistics.median(run[idx]['time_ms'] for run in runs), 1)}
+            for idx in range(len(steps) + 1)
+        ]
+    return suite
+
+
+def compare(results, baseline, time_tolerance, time_slack_ms):
+    """
+    Compare results with the baseline of the same renderer
+
+    Returns:
+        list: Human readable regressions (empty when none)
+    """
+    regressions = []
+    for name, runs in results.items():
+        expected_runs = baseline.get(name)
+        if expected_runs is None or len(expected_runs) != len(runs):
+            regressions.append(f"{name}: no matching baseline, rerun with --update")
+            continue
+        for idx, (measured, expected) in enumerate(zip(runs, expected_runs)):
+            label = f"{name}[{idx}]"
+            if measured['elements'] > expected['elements']:
+                regressions.append(f"{label}: {measured['elements']} elements > {expected['elements']}")
+            if measured['markdown_bytes'] > expected['markdown_bytes']:
+                regressions.append(f"{label}: {measured['markdown_bytes']} markdown bytes "
+                                   f"> {expected['markdown_bytes']}")
+
+        # Single reruns are noisy: compare the initial run and the median click rerun
+        timings = {
+            'initial run': (runs[0]['time_ms'], expected_runs[0]['time_ms']),
+            'median rerun': (statistics.median(run['time_ms'] for run in runs[1:]),
+                             statistics.median(run['time_ms'] for run in expected_runs[1:])),
+        }
+        for label, (measured, expected) in timings.items():
+            limit = max(expected * (1 + time_tolerance), expected + time_slack_ms)
+            if measured > limit:
+                regressions.append(f"{name} {label}: {measured:.1f} ms > {limit:.1f} ms")
+    return regressions
+
+
+def _report(results):
+    print(f"{'scenario':<18} {'run':>3} {'time ms':>9} {'elements':>9} {'md bytes':>9}")
+    for name, runs in results.items():
+        for idx, run in enumerate(runs):
+            print(f"{name:<18} {idx:>3} {run['time_ms']:>9.1f} {run['elements']:>9} {run['markdown_bytes']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard reruns against a baseline")
+    parser.add_argument('--renderer', choices=['native', 'component'], default='native')
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per scenario (median time)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--update', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help="Allowed relative slowdown (default: 0.5 = 50%%)")
+    parser.add_argument('--time-slack-ms', type=float, default=25.0,
+                        help="Slowdown in ms always allowed, for timer noise (default: 25)")
+    args = parser.parse_args(argv)
+
+    os.environ['CREDIBILITY_RENDERER'] = args.renderer
+    sys.path.insert(0, str(ROOT))
+
+    results = run_suite(args.renderer, args.repeats)
+    _report(results)
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update:
+        baselines[args.renderer] = results
+        args.baseline.write_text(json.dumps(baselines, indent=2) + '\n')
+        print(f"Baseline for '{args.renderer}' written to {args.baseline}")
+        return
+
+    regressions = compare(results, baselines.get(args.renderer, {}), args.time_tolerance,
+                          args.time_slack_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        raise SystemExit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
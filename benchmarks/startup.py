@@ -0,0 +1,93 @@
+"""
+Cold start benchmark of the dashboard.
+
+Every sample starts a fresh Python interpreter that runs main.py headlessly
+with Streamlit's AppTest and reports:
+
+- ``import_ms``: script start until Streamlit and AppTest are imported
+- ``first_run_ms``: the first script run of the process (imports of the
+  dashboard modules, table loading, first render): the first paint of a
+  freshly started server
+- ``second_session_ms``: the first run of a second session in the same
+  process, what every further user waits for
+- the heavy libraries (pandas, pyarrow, numpy) the process has imported
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --renderer native --samples 7
+    python benchmarks/startup.py --root ../other-checkout   # compare a revision
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('pandas', 'pyarrow', 'numpy')
+
+
+def _child(root):
+    """Measure one cold start in this (fresh) interpreter and print it as JSON"""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(root))
+    imported = time.perf_counter()
+    AppTest.from_file(str(root / 'main.py'), default_timeout=120).run()
+    first_run = time.perf_counter()
+    AppTest.from_file(str(root / 'main.py'), default_timeout=120).run()
+    second_session = time.perf_counter()
+    print(json.dumps({
+        'import_ms': (imported - _START) * 1000,
+        'first_run_ms': (first_run - imported) * 1000,
+        'second_session_ms': (second_session - first_run) * 1000,
+        'modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def measure(root, renderer, samples):
+    """
+    Run samples cold starts of the dashboard in root
+
+    Returns:
+        list: One measurement dict per cold start
+    """
+    env = dict(os.environ, CREDIBILITY_RENDERER=renderer)
+    results = []
+    for _ in range(samples):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', str(root)],
+            env=env, cwd=root, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cold start of the dashboard")
+    parser.add_argument('--renderer', choices=['native', 'component'], default='component')
+    parser.add_argument('--samples', type=int, default=5, help="Cold starts to run (median reported)")
+    parser.add_argument('--root', type=Path, default=ROOT, help="Checkout of the dashboard to measure")
+    parser.add_argument('--child', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child.resolve())
+        return
+
+    results = measure(args.root.resolve(), args.renderer, args.samples)
+    for name in ('import_ms', 'first_run_ms', 'second_session_ms'):
+        values = [result[name] for result in results]
+        print(f"{name:<18} median {statistics.median(values):8.1f}  "
+              f"min {min(values):8.1f}  max {max(values):8.1f}")
+    print(f"{'total_ms':<18} median "
+          f"{statistics.median(r['import_ms'] + r['first_run_ms'] for r in results):8.1f}")
+    print(f"{'imported':<18} {', '.join(results[-1]['modules']) or '-'}")
+
+
+if __name__ == '__main__':
+    _START = time.perf_counter()
+    main()
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from components.session import get_selection
+from components.table_model import Table, render_table
+from data.table_data import get_table_data
+from scoring.graph import build_credibility_graph, selection_inputs
+from scoring.selection import MATRIX_TABLES
+
+def get_derived_graph(selection=None):
+    """
+    Return the session's dependency graph of derived values, up to date with a selection
+
+    The graph lives in session state, so a rerun only recomputes the nodes
+    downstream of what changed since the previous one. The matrix tables are
+    inputs too, so a table reloaded from disk (see get_table_data) replaces
+    the one the graph was built with.
+
+    Args:
+        selection (SelectionState): Selection to derive from (default: the session's)
+    """
+    tables = {table_id: get_table_data(table_id) for table_id in MATRIX_TABLES}
+    if 'derived_graph' not in st.session_state:
+        st.session_state.derived_graph = build_credibility_graph(*tables.values())
+    graph = st.session_state.derived_graph
+    graph.set_inputs({**selection_inputs(selection or get_selection()), **tables})
+    return graph
+
+def autofill_selection(selection):
+    """
+    Fill in the Table 2 M&S credibility column of a selection from its credibility level
+
+    The design solution row stays as selected; while the weighted credibility
+    level is unknown the selected cell is kept as clicked.
+
+    Returns:
+        SelectionState: The selection with the derived Table 2 cell
+    """
+    cell = get_derived_graph(selection).get('table2_cell')
+    if cell == selection.matrix_cell("table2"):
+        return selection
+    return selection.with_matrix_cell("table2", cell)
+
+def render_graph_inspector():
+    """Show the derived value nodes of this session in the sidebar"""
+    nodes = get_derived_graph().describe()
+    with st.sidebar:
+        st.subheader("🔗 Derived values")
+        render_table(Table.from_columns({
+            'Node': [node.name for node in nodes],
+            'Value': [_node_value(node.value) for node in nodes],
+            'Depends on': [", ".join(node.dependencies) for node in nodes],
+            'Recomputed': ['input' if node.is_input else ('yes' if node.recomputed else '')
+                           for node in nodes],
+        }))
+        st.caption("Recomputed: nodes recomputed for the last change of the selection.")
+
+def _node_value(value):
+    """Short display of a node value (RankingResults as their label)"""
+    if value is None:
+        return '–'
+    if hasattr(value, 'label'):
+        return value.label or '–'
+    text = str(value)
+    return text if len(text) <= 40 else text[:40] + '…'
@@ -0,0 +1,233 @@
+// Static Streamlit component rendering a selectable grid in a single element.
+// Clicks are reported back to Python as {row, col, seq}; seq makes repeated
+// clicks on the same cell distinct values.
+(function () {
+  "use strict";
+
+  var root = document.getElementById("root");
+  var clickCount = 0;
+  var currentArgs = null;
+
+  function sendMessage(type, data) {
+    var message = Object.assign({ isStreamlitMessage: true, type: type }, data);
+    window.parent.postMessage(message, "*");
+  }
+
+  function setFrameHeight() {
+    sendMessage("streamlit:setFrameHeight", { height: document.documentElement.scrollHeight });
+  }
+
+  function reportClick(row, col) {
+    clickCount += 1;
+    sendMessage("streamlit:setComponentValue", {
+      value: { row: row, col: col, seq: Date.now() + "-" + clickCount },
+      dataType: "json"
+    });
+  }
+
+  function truncate(text, maxChars) {
+    if (!maxChars || text.length <= maxChars) {
+      return text;
+    }
+    return text.slice(0, maxChars) + "...";
+  }
+
+  function element(tag, className, text) {
+    var node = document.createElement(tag);
+    if (className) {
+      node.className = className;
+    }
+    if (text !== undefined && text !== null) {
+      node.textContent = text;
+    }
+    return node;
+  }
+
+  function selectableCell(text, title, selected, onClick) {
+    var cell = element("td", selected ? "cell selected" : "cell", text);
+    if (title) {
+      cell.title = title;
+    }
+    cell.addEventListener("click", onClick);
+    return cell;
+  }
+
+  // Table 1: one selection per column, toggled by clicking the selected cell again
+  function renderColumns(args) {
+    var columns = args.columns;
+    var rows = args.rows;
+    var selection = args.selection || {};
+    var firstSelectable = args.header_column ? 1 : 0;
+
+    var table = element("table", "grid");
+    var header = element("tr");
+    columns.forEach(function (name) {
+      header.appendChild(element("th", null, name));
+    });
+    table.appendChild(header);
+
+    rows.forEach(function (values, rowIdx) {
+      var row = element("tr");
+      values.forEach(function (value, colIdx) {
+        var text = String(value);
+        if (colIdx < firstSelectable) {
+          row.appendChild(element("td", "label", text));
+          return;
+        }
+        var selected = selection[colIdx] === rowIdx;
+        row.appendChild(selectableCell(truncate(text, args.max_chars), text, selected, function () {
+          if (selected) {
+            delete selection[colIdx];
+          } else {
+            selection[colIdx] = rowIdx;
+          }
+          args.selection = selection;
+          render(args);
+          reportClick(rowIdx, colIdx);
+        }));
+      });
+      table.appendChild(row);
+    });
+    return table;
+  }
+
+  // Tables 2-4: a single selected cell, toggled by clicking it again
+  function singleSelectionCell(args, text, title, rowIdx, colIdx, extraClass) {
+    var selected = Array.isArray(args.selected) &&
+      args.selected[0] === rowIdx && args.selected[1] === colIdx;
+    var cell = selectableCell(text, title, selected, function () {
+      args.selected = selected ? null : [rowIdx, colIdx];
+      render(args);
+      reportClick(rowIdx, colIdx);
+    });
+    if (extraClass) {
+      cell.className += " " + extraClass;
+    }
+    return cell;
+  }
+
+  // Row title on the left, rows of cells, column labels and title underneath
+  function renderLabelledMatrix(args, buildCell) {
+    var data = args.table;
+    var table = element("table", "grid matrix");
+
+    data.row_labels.forEach(function (rowLabel, rowIdx) {
+      var row = element("tr");
+      if (rowIdx === 0) {
+        var title = element("td", "label row-title", data.row_title);
+        title.rowSpan = data.row_labels.length;
+        row.appendChild(title);
+      }
+      row.appendChild(element("td", "label", rowLabel));
+      data.col_labels.forEach(function (_, colIdx) {
+        row.appendChild(buildCell(data.data[rowIdx][colIdx], rowIdx, colIdx));
+      });
+      table.appendChild(row);
+    });
+
+    var labels = element("tr");
+    labels.appendChild(element("td"));
+    labels.appendChild(element("td"));
+    data.col_labels.forEach(function (colLabel) {
+      labels.appendChild(element("td", "label", colLabel));
+    });
+    table.appendChild(labels);
+
+    var titleRow = element("tr");
+    titleRow.appendChild(element("td"));
+    titleRow.appendChild(element("td"));
+    var colTitle = element("td", "col-title", data.col_title);
+    colTitle.colSpan = data.col_labels.length;
+    titleRow.appendChild(colTitle);
+    table.appendChild(titleRow);
+    return table;
+  }
+
+  // Table 2: numeric values
+  function renderNumericMatrix(args) {
+    return renderLabelledMatrix(args, function (value, rowIdx, colIdx) {
+      return singleSelectionCell(args, String(value), null, rowIdx, colIdx);
+    });
+  }
+
+  // Table 3: colored cells
+  function renderColorMatrix(args) {
+    return renderLabelledMatrix(args, function (color, rowIdx, colIdx) {
+      return singleSelectionCell(args, "", "Color: " + color, rowIdx, colIdx, "color color-" + color);
+    });
+  }
+
+  // Table 4: risk categories (G, Y, R) against CC1-CC3 text
+  function renderTextMatrix(args) {
+    var data = args.table;
+    var columns = ["CC1", "CC2", "CC3"];
+    var table = element("table", "grid");
+
+    var header = element("tr");
+    header.appendChild(element("th", null, "RISK ASSESSMENT"));
+    columns.forEach(function (name) {
+      header.appendChild(element("th", null, name));
+    });
+    table.appendChild(header);
+
+    data.categories.forEach(function (category, rowIdx) {
+      var row = element("tr");
+      row.appendChild(element("td", "label category category-" + category, category));
+      columns.forEach(function (name, colIdx) {
+        var text = data[name][rowIdx];
+        var display = truncate(text.replace(/\u2022/g, "").replace(/\n/g, " "), args.max_chars);
+        row.appendChild(singleSelectionCell(args, display, text, rowIdx, colIdx));
+      });
+      table.appendChild(row);
+    });
+    return table;
+  }
+
+  var renderers = {
+    columns: renderColumns,
+    matrix_numeric: renderNumericMatrix,
+    matrix_color: renderColorMatrix,
+    matrix_text: renderTextMatrix
+  };
+
+  function applyTheme(theme) {
+    if (!theme) {
+      return;
+    }
+    var style = document.documentElement.style;
+    if (theme.primaryColor) {
+      style.setProperty("--primary-color", theme.primaryColor);
+    }
+    if (theme.textColor) {
+      style.setProperty("--text-color", theme.textColor);
+    }
+  }
+
+  function render(args) {
+    currentArgs = args;
+    var renderer = renderers[args.kind];
+    root.textContent = "";
+    if (renderer) {
+      root.appendChild(renderer(args));
+    } else {
+      root.appendChild(element("div", null, "Unknown grid kind: " + args.kind));
+    }
+    setFrameHeight();
+  }
+
+  window.addEventListener("message", function (event) {
+    if (!event.data || event.data.type !== "streamlit:render") {
+      return;
+    }
+    applyTheme(event.data.theme);
+    render(JSON.parse(event.data.args.payload));
+  });
+
+  window.addEventListener("resize", function () {
+    if (currentArgs) {
+      setFrameHeight();
+    }
+  });
+
+  sendMessage("streamlit:componentReady", { apiVersion: 1 });
+})();
@@ -0,0 +1,47 @@
+from functools import lru_cache
+
+import streamlit as st
+
+from components.session import get_selection
+from scoring.engine import FACTOR_COLUMNS, LEVEL_CATEGORIES
+from scoring.improvement import minimal_improvement
+from scoring.selection import SelectionState
+
+def create_improvement_panel():
+    """Show the cheapest factor upgrades that reach a target overall credibility level"""
+    st.subheader("Reach a target credibility level")
+    categories = LEVEL_CATEGORIES['overall_credibility']
+    target = st.selectbox("Target (weighted) credibility level", options=sorted(categories),
+                          index=1, format_func=lambda level: f"{level} ({categories[level]})",
+                          key="improvement_target")
+    
+    with st.expander("Upgrade costs per metric step"):
+        costs = [
+            st.number_input(column, min_value=0.0, value=1.0, step=0.5,
+                            key=f"improvement_cost_{idx}")
+            for idx, column in enumerate(FACTOR_COLUMNS)
+        ]
+    
+    selection = get_selection()
+    try:
+        plan = _minimal_improvement(selection.factor_code, target,
+                                    tuple(float(cost) for cost in costs))
+    except ValueError as error:
+        st.info(f"{error} to search for upgrades.")
+        return
+    
+    if plan is None:
+        st.warning("No combination of factor upgrades reaches this level.")
+    elif not plan.changes:
+        st.success(f"Already at {plan.result.weighted.label}.")
+    else:
+        st.write(f"**Cheapest upgrades** (cost {plan.cost:g}): {plan.label}")
+        st.write(f"Resulting levels: Development {plan.result.development.label}, "
+                 f"Use {plan.result.use.label}, Support {plan.result.support.label}, "
+                 f"credibility {plan.result.weighted.label}")
+
+@lru_cache(maxsize=1024)
+def _minimal_improvement(factor_code, target, step_costs):
+    """Cached search per factor code, target and costs, shared by all sessions"""
+    return minimal_improvement(SelectionState(factor_code).assessment, target,
+                               costs=dict(zip(FACTOR_COLUMNS, step_costs)))
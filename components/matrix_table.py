@@ -1,8 +1,12 @@
 import streamlit as st
 
 from components.color_matrix import _create_color_matrix
+from components.matrix_utils import toggle_matrix_cell_selection
 from components.numeric_matrix import _create_numeric_matrix
+from components.selection_grid import selection_grid
+from components.session import get_selection
 from components.text_matrix import _create_text_matrix
+from config import RENDERER
 
 def create_matrix_table(table_data, table_id, table_type):
     """
@@ -14,14 +18,24 @@ def create_matrix_table(table_data, table_id, table_type):
         table_type (str): Type of matrix table (matrix_numeric, matrix_color, matrix_text)
     """
     
-    # Initialize table selection in session state
-    if table_id not in st.session_state.selected_cells:
-        st.session_state.selected_cells[table_id] = {}
-        st.session_state.selected_cells[table_id]['selected_cell'] = None
-    
-    if table_type == "matrix_numeric":
+    if RENDERER != "native":
+        _create_grid_matrix(table_data, table_id, table_type)
+    elif table_type == "matrix_numeric":
         _create_numeric_matrix(table_data, table_id)
     elif table_type == "matrix_color":
         _create_color_matrix(table_data, table_id)
     elif table_type == "matrix_text":
         _create_text_matrix(table_data, table_id)
+
+def _create_grid_matrix(table_data, table_id, table_type):
+    """Render any of the three matrix shapes as one selection grid element"""
+    selected_cell = get_selection().matrix_cell(table_id)
+    
+    selection_grid(
+        table_type,
+        key=f"{table_id}_grid",
+        on_click=lambda row_idx, col_idx: toggle_matrix_cell_selection(table_id, row_idx, col_idx),
+        table=dict(table_data),
+        selected=list(selected_cell) if selected_cell else None,
+        max_chars=60,
+    )
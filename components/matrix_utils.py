@@ -1,12 +1,65 @@
 import streamlit as st
 
-def toggle_matrix_cell_selection(table_id, row_idx, col_idx, is_selected):
-    """Toggle the selection state of a matrix cell"""
-    if is_selected:
-        st.session_state.selected_cells[table_id]['selected_cell'] = None
+from components.derived import autofill_selection
+from components.session import get_selection, set_selection
+from components.styles import register_stylesheet
+
+# Label classes shared by the matrix renderers
+register_stylesheet("matrix_labels", """
+.cad-label {
+    background-color: #f0f0f0;
+    padding: 10px;
+    text-align: center;
+    font-weight: bold;
+    border-radius: 5px;
+    margin: 2px;
+    color: #000000;
+}
+.cad-label-centered {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+}
+.cad-row-title {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-weight: bold;
+    font-size: 16px;
+    background-color: #f0f0f0;
+    border-radius: 5px;
+    margin-right: 10px;
+    color: #000000;
+}
+.cad-col-title {
+    text-align: center;
+    margin-top: 15px;
+    font-weight: bold;
+    font-size: 16px;
+    color: #000000;
+}
+""")
+
+def toggle_matrix_cell_selection(table_id, row_idx, col_idx):
+    """
+    Toggle the selection state of a matrix cell
+    
+    Runs as a button callback, so only the enclosing fragment reruns. In
+    Table 2 the M&S credibility column follows the credibility level, so a
+    click selects the design solution row (clicking that row again clears it).
+    """
+    selection = get_selection()
+    cell = selection.matrix_cell(table_id)
+    if table_id == "table2":
+        clicked = autofill_selection(selection.with_matrix_cell(table_id, (row_idx, col_idx)))
+        if cell is not None and clicked.matrix_cell(table_id) == cell:
+            set_selection(selection.with_matrix_cell(table_id, None))
+        else:
+            set_selection(clicked)
+    elif cell == (row_idx, col_idx):
+        set_selection(selection.with_matrix_cell(table_id, None))
     else:
-        st.session_state.selected_cells[table_id]['selected_cell'] = (row_idx, col_idx)
-    st.rerun()
+        set_selection(selection.with_matrix_cell(table_id, (row_idx, col_idx)))
 
 def truncate_text(text, max_length):
     """Truncate text if it exceeds max_length"""
@@ -14,7 +67,7 @@ def truncate_text(text, max_length):
 
 def display_matrix_selected_values(table_data, table_id, table_type):
     """Display the currently selected values for matrix tables"""
-    selected_cell = st.session_state.selected_cells[table_id].get('selected_cell')
+    selected_cell = get_selection().matrix_cell(table_id)
     
     if selected_cell:
         row_idx, col_idx = selected_cell
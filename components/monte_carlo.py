@@ -0,0 +1,73 @@
+import streamlit as st
+
+from components.session import get_selection
+from components.table_model import Table, render_table
+from scoring.batch import CODE_READINESS
+from scoring.engine import FACTOR_COLUMNS, LEVEL_CATEGORIES
+from scoring.montecarlo import DEFAULT_SAMPLES, LEVELS, METRICS, simulate
+
+# Result rows: label, MonteCarloResult field and range table
+_RESULT_ROWS = (
+    ('Development', 'development', 'development'),
+    ('Use', 'use', 'use'),
+    ('Support', 'support', 'support_evidence'),
+    ('Credibility (not weighted)', 'not_weighted', 'overall_credibility'),
+    ('Credibility (weighted)', 'weighted', 'overall_credibility'),
+)
+
+def create_monte_carlo_panel():
+    """Propagate uncertain factor ratings to distributions of ranking levels"""
+    if not st.toggle("Rate factors with uncertainty (Monte Carlo)", key="monte_carlo_enabled"):
+        return
+    
+    st.markdown("*Weights per metric for each column (scaled to probabilities). "
+                "Leave code readiness at zero to assess without it.*")
+    selection = get_selection()
+    weights = st.data_editor(
+        _initial_weights(selection),
+        key=f"monte_carlo_weights_{selection.factor_code}",
+        hide_index=True,
+        use_container_width=True,
+        disabled=['Factor'],
+        column_config={
+            f"P({metric})": st.column_config.NumberColumn(min_value=0.0, step=0.1)
+            for metric in METRICS
+        },
+    )
+    samples = st.select_slider("Samples", options=[10_000, 50_000, 100_000, 200_000, 500_000, 1_000_000],
+                               value=DEFAULT_SAMPLES, key="monte_carlo_samples")
+    
+    distributions = [
+        tuple(float(row[f"P({metric})"] or 0) for metric in METRICS)
+        for _, row in weights.iterrows()
+    ]
+    try:
+        result = simulate(distributions, samples=samples)
+    except ValueError as error:
+        st.warning(str(error))
+        return
+    
+    data = {'Ranking': [label for label, _, _ in _RESULT_ROWS]}
+    for level in LEVELS:
+        data[f"Level {level}"] = [
+            f"{getattr(result, name)[level - 1]:.1%} ({LEVEL_CATEGORIES[table_type][level]})"
+            for _, name, table_type in _RESULT_ROWS
+        ]
+    render_table(Table.from_columns(data))
+    st.caption(f"Share of {result.samples:,} sampled assessments at each ranking level.")
+
+def _initial_weights(selection):
+    """Certain ratings for selected factors, uniform weights for the others"""
+    import pandas as pd  # only needed by the weights editor, keep it off the default rerun path
+    
+    rows = []
+    for idx, column in enumerate(FACTOR_COLUMNS):
+        metric = selection.factor_metric(column)
+        if metric is not None:
+            weights = [1.0 if value == metric else 0.0 for value in METRICS]
+        elif idx == CODE_READINESS:
+            weights = [0.0] * len(METRICS)  # code readiness is optional
+        else:
+            weights = [1.0] * len(METRICS)
+        rows.append({'Factor': column, **{f"P({value})": weight for value, weight in zip(METRICS, weights)}})
+    return pd.DataFrame(rows)
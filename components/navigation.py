@@ -0,0 +1,52 @@
+import streamlit as st
+
+# Sections of the dashboard in navigation order: key -> label
+SECTIONS = {
+    "assessment": "Table 1 & summary",
+    "table2": "Table 2: Design solution",
+    "table3": "Table 3: Decision consequence",
+    "table4": "Table 4: Risk actions",
+}
+
+# Widget keys (or key prefixes ending in "_") of each section whose values
+# must outlive a visit to another section
+SECTION_WIDGET_KEYS = {
+    "assessment": (
+        "what_if_downgrades",
+        "improvement_target",
+        "improvement_cost_",
+        "monte_carlo_enabled",
+        "monte_carlo_samples",
+        "assessment_project",
+    ),
+}
+
+def select_section():
+    """
+    Render the section picker and keep the widget values of the hidden sections
+
+    Streamlit drops the value of every widget that was not rendered in a
+    full run, so the values of the sections that are not shown are written
+    back to the session state as plain entries.
+
+    Returns:
+        str: Key of the section to render
+    """
+    section = st.radio("Section", options=list(SECTIONS), format_func=SECTIONS.get,
+                       horizontal=True, key="section", label_visibility="collapsed")
+    for hidden, widget_keys in SECTION_WIDGET_KEYS.items():
+        if hidden != section:
+            keep_widget_state(widget_keys)
+    return section
+
+def keep_widget_state(widget_keys):
+    """
+    Keep widget values in the session state while their widgets are not rendered
+
+    Args:
+        widget_keys (tuple): Widget keys, or key prefixes ending in "_"
+    """
+    for key in list(st.session_state.keys()):
+        if any(key == widget_key or (widget_key.endswith("_") and key.startswith(widget_key))
+               for widget_key in widget_keys):
+            st.session_state[key] = st.session_state[key]
@@ -0,0 +1,128 @@
+import threading
+import time
+from functools import lru_cache
+
+import streamlit as st
+
+from config import DB_PATH
+from data.assessment_store import PORTFOLIO_KEYS, get_assessment_store
+from scoring.engine import LEVEL_CATEGORIES
+
+# Filters of the portfolio view: grouping column -> label
+_FILTERS = {
+    'project': "Program",
+    'weighted_level': "Credibility level",
+    'development_level': "Development level",
+    'use_level': "Use level",
+    'support_level': "Support level",
+    'risk_color': "Table 3 risk color",
+    'action': "Table 4 action",
+}
+
+class PortfolioCounts:
+    """
+    Process-wide copy of the store's portfolio counts, kept up to date incrementally
+    
+    The first refresh reads the pre-aggregated counts; later refreshes only
+    count the assessments stored since, so a rerun never scans the store.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self._counts = None
+        self._last_id = 0
+        self._frame = None
+        self._lock = threading.Lock()
+    
+    def refresh(self):
+        """Return the counts as a DataFrame with one row per grouping key"""
+        with self._lock:
+            if self._counts is None:
+                self._counts, self._last_id = self.store.portfolio_counts()
+                self._frame = None
+            else:
+                new_counts, self._last_id = self.store.portfolio_counts_since(self._last_id)
+                if new_counts:
+                    self._counts.update(new_counts)
+                    self._frame = None
+            if self._frame is None:
+                self._frame = _counts_frame(self._counts)
+            return self._frame
+
+def _counts_frame(counts):
+    import pandas as pd
+    
+    frame = pd.DataFrame(list(counts.keys()), columns=list(PORTFOLIO_KEYS))
+    frame['count'] = list(counts.values())
+    for column in ('project', 'risk_color', 'action'):
+        frame[column] = frame[column].astype('category')
+    return frame
+
+@lru_cache(maxsize=None)
+def _portfolio_counts(path):
+    """Process-wide portfolio counts of a database file"""
+    return PortfolioCounts(get_assessment_store(path))
+
+def render_portfolio():
+    """Portfolio page: level, risk color and action distributions of stored assessments"""
+    st.set_page_config(page_title="Portfolio · Credibility Assessment", layout="wide")
+    st.title("Portfolio")
+    
+    start = time.perf_counter()
+    frame = _portfolio_counts(DB_PATH).refresh()
+    if frame.empty:
+        st.info("No stored assessments yet. Save assessments from the dashboard to see them here.")
+        return
+    
+    mask = None
+    with st.sidebar:
+        st.subheader("Filters")
+        for column, label in _FILTERS.items():
+            options = sorted(frame[column].unique().tolist())
+            chosen = st.multiselect(label, options, key=f"portfolio_{column}",
+                                    format_func=lambda value, column=column: _format(column, value))
+            if chosen:
+                selected = frame[column].isin(chosen)
+                mask = selected if mask is None else mask & selected
+    filtered = frame if mask is None else frame[mask]
+    
+    st.metric("Assessments", f"{int(filtered['count'].sum()):,}")
+    
+    cols = st.columns(2)
+    with cols[0]:
+        _distribution(filtered, 'weighted_level', "Credibility level (weighted)")
+        _distribution(filtered, 'risk_color', "Table 3 risk color")
+    with cols[1]:
+        _phase_levels(filtered)
+        _distribution(filtered, 'action', "Table 4 recommended action")
+    
+    st.caption(f"Rendered from {len(frame):,} aggregate rows in "
+               f"{(time.perf_counter() - start) * 1000:.0f} ms.")
+
+def _distribution(frame, column, title):
+    """Bar chart of the assessment count per value of one column"""
+    st.subheader(title)
+    totals = frame.groupby(column, observed=True)['count'].sum()
+    totals.index = [_format(column, value) for value in totals.index]
+    st.bar_chart(totals)
+
+def _phase_levels(frame):
+    """Assessment count per ranking level of each phase"""
+    import pandas as pd
+    
+    st.subheader("Phase ranking levels")
+    totals = pd.DataFrame({
+        phase: frame.groupby(column)['count'].sum()
+        for phase, column in (('Development', 'development_level'), ('Use', 'use_level'),
+                              ('Support', 'support_level'))
+    }).fillna(0)
+    totals.index = [_format('development_level', level) for level in totals.index]
+    st.bar_chart(totals, stack=False)
+
+def _format(column, value):
+    """Readable filter / axis label of a grouping value"""
+    if column == 'weighted_level':
+        return f"{value} ({LEVEL_CATEGORIES['overall_credibility'][value]})" if value else "Unranked"
+    if column.endswith('_level'):
+        return str(value) if value else "Unranked"
+    return value or "Not selected"
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+from components.table_model import Table, render_table
+from config import METRICS_FILE, PROFILE
+
+# Process-wide totals per section for the Prometheus export: name -> [count, seconds]
+_totals = {}
+_lock = threading.Lock()
+
+def profile_section(name):
+    """
+    Time a section of the dashboard when profiling or metrics export is enabled
+    
+    Args:
+        name (str): Section name, e.g. 'create_summary_table'
+    
+    Returns:
+        A context manager (a no-op one when profiling is off)
+    """
+    if not (PROFILE or METRICS_FILE):
+        return nullcontext()
+    return _timed(name)
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+def record_timing(name, seconds):
+    """Keep a section timing for the developer sidebar and the metrics file"""
+    timings = st.session_state.setdefault('section_timings', {})
+    _, count, total = timings.get(name, (0.0, 0, 0.0))
+    timings[name] = (seconds, count + 1, total + seconds)
+    if METRICS_FILE:
+        _export(name, seconds)
+
+def _export(name, seconds):
+    """Append a JSON line, or rewrite the Prometheus text file, under a process lock"""
+    with _lock:
+        count, total = _totals.get(name, (0, 0.0))
+        _totals[name] = (count + 1, total + seconds)
+        if METRICS_FILE.endswith(('.prom', '.txt')):
+            _write_prometheus(METRICS_FILE)
+        else:
+            with open(METRICS_FILE, 'a', encoding='utf-8') as metrics:
+                metrics.write(json.dumps({'ts': time.time(), 'section': name,
+                                          'ms': round(seconds * 1000, 3)}) + '\n')
+
+def _write_prometheus(path):
+    """Write the section totals in the Prometheus text format, replacing the file atomically"""
+    lines = [
+        "# HELP credibility_section_seconds Render time of dashboard sections",
+        "# TYPE credibility_section_seconds summary",
+    ]
+    for name, (count, total) in sorted(_totals.items()):
+        lines.append(f'credibility_section_seconds_sum{{section="{name}"}} {total:.6f}')
+        lines.append(f'credibility_section_seconds_count{{section="{name}"}} {count}')
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as metrics:
+        metrics.write("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+
+def render_profiling_sidebar():
+    """Show the section timings of this session in the sidebar"""
+    timings = st.session_state.get('section_timings', {})
+    with st.sidebar:
+        st.subheader("⏱️ Render times")
+        if not timings:
+            st.write("No timings yet.")
+            return
+        rows = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)
+        render_table(Table.from_columns({
+            'Section': [name for name, _ in rows],
+            'Last ms': [round(last * 1000, 2) for _, (last, _, _) in rows],
+            'Mean ms': [round(total / count * 1000, 2) for _, (_, count, total) in rows],
+            'Runs': [count for _, (_, count, _) in rows],
+        }))
+        st.caption("Fragment reruns are included from the next full run on.")
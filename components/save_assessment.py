@@ -0,0 +1,23 @@
+import streamlit as st
+
+from components.session import get_selection
+from config import DB_PATH
+from data.assessment_store import get_assessment_store
+
+def create_save_assessment_form():
+    """Save the current selections and their scores to the assessment store"""
+    with st.form("save_assessment", clear_on_submit=False):
+        project = st.text_input("Project / program", key="assessment_project")
+        submitted = st.form_submit_button("💾 Save assessment")
+    
+    if not submitted:
+        return
+    if not project.strip():
+        st.warning("Enter a project name to save the assessment.")
+        return
+    
+    selection = get_selection()
+    store = get_assessment_store(DB_PATH)
+    store.save(selection.assessment, project.strip(), selection.matrix_cells)
+    store.flush()
+    st.success(f"Assessment saved to project '{project.strip()}'.")
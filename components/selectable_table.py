@@ -1,62 +1,107 @@
 import streamlit as st
 
-def create_selectable_table(df, table_id):
+from components.derived import autofill_selection
+from components.selection_grid import selection_grid
+from components.session import get_selection, set_selection
+from config import RENDERER
+from scoring.engine import FACTOR_COLUMNS
+
+def create_selectable_table(table, table_id):
     """
     Create a selectable table where user can select one cell per column
     
     Args:
-        df (pandas.DataFrame): Data to display
+        table (Table): Data to display
         table_id (str): Unique identifier for the table
     """
     
-    # Initialize table selection in session state
-    if table_id not in st.session_state.selected_cells:
-        st.session_state.selected_cells[table_id] = {}
+    if RENDERER == "native":
+        _create_button_table(table, table_id)
+    else:
+        _create_grid_table(table, table_id)
+
+def _create_grid_table(table, table_id):
+    """Render the table as one selection grid element (Metrics column as row labels)"""
+    columns = list(table.columns)
+    selected = get_selection()
+    selection = {
+        col_idx: selected.factor_row(col_name)
+        for col_idx, col_name in enumerate(columns)
+        if selected.factor_row(col_name) is not None
+    }
     
+    selection_grid(
+        "columns",
+        key=f"{table_id}_grid",
+        on_click=lambda row_idx, col_idx: _toggle_cell_selection(table_id, columns[col_idx], row_idx),
+        columns=columns,
+        rows=[[str(value) for value in row] for row in table.rows],
+        selection=selection,
+        header_column=columns[0] == 'Metrics',
+        max_chars=80,
+    )
+
+def _create_button_table(table, table_id):
+    """Render the table as a grid of buttons, one per cell"""
     # Create columns for the table layout
-    cols = st.columns([1] + [3] * (len(df.columns) - 1))  # First column narrower for metrics
+    cols = st.columns([1] + [3] * (len(table.columns) - 1))  # First column narrower for metrics
     
     # Header row
-    for idx, col_name in enumerate(df.columns):
+    for idx, col_name in enumerate(table.columns):
         with cols[idx]:
             st.markdown(f"**{col_name}**")
     
+    selected = get_selection()
+    
     # Data rows
-    for row_idx in range(len(df)):
-        cols = st.columns([1] + [3] * (len(df.columns) - 1))
+    for row_idx in range(len(table)):
+        cols = st.columns([1] + [3] * (len(table.columns) - 1))
         
-        for col_idx, col_name in enumerate(df.columns):
+        for col_idx, col_name in enumerate(table.columns):
             with cols[col_idx]:
-                cell_value = df.iloc[row_idx, col_idx]
+                cell_value = table.cell(row_idx, col_idx)
                 
                 # Create unique key for each cell
                 cell_key = f"{table_id}_{col_name}_{row_idx}"
                 
                 # Check if this cell is selected
-                is_selected = st.session_state.selected_cells[table_id].get(col_name) == row_idx
+                is_selected = selected.factor_row(col_name) == row_idx
                 
                 # Create button with different styling based on selection
                 if col_name == 'Metrics':
                     # For metrics column, just display the number
-                    if st.button(str(cell_value), key=cell_key, 
-                               type="primary" if is_selected else "secondary"):
-                        _toggle_cell_selection(table_id, col_name, row_idx, is_selected)
+                    st.button(str(cell_value), key=cell_key,
+                              type="primary" if is_selected else "secondary",
+                              on_click=_toggle_cell_selection, args=(table_id, col_name, row_idx))
                 else:
                     # For other columns, show truncated text
                     display_text = _truncate_text(str(cell_value), 80)
                     
-                    if st.button(display_text, key=cell_key,
-                               type="primary" if is_selected else "secondary",
-                               help=str(cell_value)):  # Show full text on hover
-                        _toggle_cell_selection(table_id, col_name, row_idx, is_selected)
+                    st.button(display_text, key=cell_key,
+                              type="primary" if is_selected else "secondary",
+                              help=str(cell_value),  # Show full text on hover
+                              on_click=_toggle_cell_selection, args=(table_id, col_name, row_idx))
 
-def _toggle_cell_selection(table_id, col_name, row_idx, is_selected):
-    """Toggle the selection state of a cell"""
-    if is_selected:
-        st.session_state.selected_cells[table_id][col_name] = None
+def _toggle_cell_selection(table_id, col_name, row_idx):
+    """
+    Toggle the selection state of a cell
+    
+    Runs as a button callback, before the rerun of the enclosing fragment,
+    so the fragment renders the new selection without a second rerun.
+    Only the factor columns are selectable (clicks on Metrics are ignored).
+    When the new credibility level moves the Table 2 cell, the whole app is
+    rerun so the Table 2 section shows it too (see render_assessment_section).
+    """
+    if col_name not in FACTOR_COLUMNS:
+        return
+    selection = get_selection()
+    if selection.factor_row(col_name) == row_idx:
+        updated = autofill_selection(selection.with_factor_row(col_name, None))
     else:
-        st.session_state.selected_cells[table_id][col_name] = row_idx
-    st.rerun()
+        updated = autofill_selection(selection.with_factor_row(col_name, row_idx))
+    if updated.matrix_cell("table2") != selection.matrix_cell("table2"):
+        st.session_state.table2_autofilled = True
+    set_selection(updated)
 
 def _truncate_text(text, max_length):
     """Truncate text if it exceeds max_length"""
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = Path(__file__).parent / "frontend" / "selection_grid"
+
+# Bundled static front end, served by Streamlit without a build step
+_selection_grid = components.declare_component("selection_grid", path=str(_FRONTEND_DIR))
+
+def selection_grid(kind, key, on_click, **args):
+    """
+    Render a selectable grid as a single component element
+
+    The component only sends the clicked cell back to the server; on_click is
+    called with (row_idx, col_idx) from the widget callback, before the
+    enclosing fragment reruns.
+
+    Args:
+        kind (str): Grid layout rendered by the front end (e.g. "columns")
+        key (str): Unique widget key
+        on_click (callable): Called with (row_idx, col_idx) for every click
+        **args: JSON-serialisable data for the front end
+    """
+    # One JSON string argument: Streamlit inspects list and dict arguments with
+    # its dataframe detection, which imports pandas on the first rerun
+    _selection_grid(payload=json.dumps(dict(args, kind=kind)), key=key, default=None,
+                    on_change=lambda: _dispatch_click(key, on_click))
+
+def _dispatch_click(key, on_click):
+    """Forward the click stored in the widget value to on_click"""
+    event = st.session_state.get(key)
+    if event:
+        on_click(event['row'], event['col'])
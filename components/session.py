@@ -0,0 +1,78 @@
+import uuid
+
+import streamlit as st
+
+from config import STATE_BACKEND, URL_STATE
+from data.state_backend import get_state_backend
+from data.table_data import check_matrix_cell
+from scoring.selection import MATRIX_TABLES, SelectionState
+
+# Query string parameter holding the selection token in URL state mode
+QUERY_PARAM = "s"
+
+# Query string parameter holding the session id of an external state backend
+SESSION_PARAM = "sid"
+
+def get_selection():
+    """Return the session's packed selection state, empty on first use"""
+    if 'selection' not in st.session_state:
+        st.session_state.selection = SelectionState()
+    return st.session_state.selection
+
+def set_selection(selection):
+    """Replace the session's selection state (and the query string in URL state mode)"""
+    st.session_state.selection = selection
+    if URL_STATE:
+        if selection.code:
+            st.query_params[QUERY_PARAM] = selection.to_token()
+        else:
+            st.query_params.pop(QUERY_PARAM, None)
+    elif STATE_BACKEND != "session":
+        get_state_backend(STATE_BACKEND).set(_session_id(), "selection", selection.code)
+
+def restore_selection():
+    """
+    Load the selection kept outside Streamlit session state, if configured
+    
+    Called at the top of every full run; fragment reruns work on the loaded
+    copy and callbacks write changes back through set_selection.
+    """
+    if URL_STATE:
+        restore_selection_from_url()
+    elif STATE_BACKEND != "session":
+        code = get_state_backend(STATE_BACKEND).get(_session_id(), "selection", 0)
+        st.session_state.selection = SelectionState(code)
+    else:
+        get_selection()
+
+def _session_id():
+    """Session id carried in the query string, created on first use"""
+    session_id = st.query_params.get(SESSION_PARAM)
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        st.query_params[SESSION_PARAM] = session_id
+    return session_id
+
+def restore_selection_from_url():
+    """
+    Rebuild the selection from the query string
+    
+    Called at the top of every full run in URL state mode, so any replica
+    can serve a rerun and a shared link opens the same selection.
+    """
+    token = st.query_params.get(QUERY_PARAM)
+    selection = SelectionState()
+    if token:
+        try:
+            selection = _within_tables(SelectionState.from_token(token))
+        except ValueError:
+            st.warning("The selection in this link is not valid and was ignored.")
+    st.session_state.selection = selection
+
+def _within_tables(selection):
+    """Check that every selected matrix cell exists in its table"""
+    for table_id in MATRIX_TABLES:
+        cell = selection.matrix_cell(table_id)
+        if cell is not None:
+            check_matrix_cell(table_id, cell)
+    return selection
@@ -0,0 +1,29 @@
+import streamlit as st
+
+# Stylesheets by name, registered once at import by the renderers that use them
+_STYLESHEETS = {}
+
+def register_stylesheet(name, css):
+    """
+    Register a stylesheet to be emitted by emit_stylesheets
+
+    Args:
+        name (str): Unique stylesheet name (registering it again replaces it)
+        css (str): CSS rules, without the <style> tag
+    """
+    _STYLESHEETS[name] = css.strip()
+
+def stylesheet_html():
+    """Return every registered stylesheet as one <style> block"""
+    return "<style>\n" + "\n".join(_STYLESHEETS.values()) + "\n</style>"
+
+def emit_stylesheets():
+    """
+    Emit all registered stylesheets as a single markdown element
+
+    Call this once from the main script body, outside of any fragment: the
+    element then survives fragment reruns, so a click only resends the
+    class-based markup of its own table, not the styles.
+    """
+    if _STYLESHEETS:
+        st.markdown(stylesheet_html(), unsafe_allow_html=True)
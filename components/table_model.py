@@ -0,0 +1,74 @@
+import streamlit as st
+
+class Table:
+    """
+    Small in-memory table with ordered columns
+    
+    Covers what the dashboard needs from its small tables (Table 1 and the
+    one- to three-row summary tables) without importing pandas.
+    """
+    
+    __slots__ = ('columns', 'rows')
+    
+    def __init__(self, columns, rows):
+        """
+        Args:
+            columns (sequence): Column names
+            rows (sequence): Rows, each a sequence with one value per column
+        """
+        self.columns = tuple(columns)
+        self.rows = [tuple(row) for row in rows]
+        if any(len(row) != len(self.columns) for row in self.rows):
+            raise ValueError(f"Every row needs {len(self.columns)} values")
+    
+    @classmethod
+    def from_columns(cls, data):
+        """
+        Build a table from a column name -> values mapping
+        
+        Args:
+            data (mapping): Column name -> sequence of values (all of the same length)
+        
+        Returns:
+            Table: The table
+        """
+        columns = list(data)
+        lengths = {len(data[column]) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        return cls(columns, zip(*(data[column] for column in columns)))
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def cell(self, row_idx, column):
+        """Value at a row index and column name (or column index)"""
+        col_idx = column if isinstance(column, int) else self.columns.index(column)
+        return self.rows[row_idx][col_idx]
+    
+    def column(self, name):
+        """Values of one column"""
+        col_idx = self.columns.index(name)
+        return [row[col_idx] for row in self.rows]
+    
+    def to_markdown(self):
+        """Render the table as a Markdown pipe table"""
+        lines = [
+            "| " + " | ".join(_markdown_cell(column) for column in self.columns) + " |",
+            "|" + "---|" * len(self.columns),
+        ]
+        for row in self.rows:
+            lines.append("| " + " | ".join(_markdown_cell(value) for value in row) + " |")
+        return "\n".join(lines)
+
+def render_table(table):
+    """Show a small table as a static Markdown table"""
+    st.markdown(table.to_markdown())
+
+def _markdown_cell(value):
+    """Format a value for a Markdown table cell (floats to at most 4 decimals)"""
+    if isinstance(value, float):
+        text = f"{value:.4f}".rstrip('0').rstrip('.')
+    else:
+        text = str(value)
+    return text.replace('|', '\\|').replace('\n', '<br>')
@@ -1,6 +1,22 @@
 import streamlit as st
 
 from components.matrix_utils import toggle_matrix_cell_selection, truncate_text
+from components.session import get_selection
+from components.styles import register_stylesheet
+
+register_stylesheet("text_matrix", """
+.cad-category {
+    background-color: #ccc;
+    color: black;
+    padding: 10px;
+    text-align: center;
+    font-weight: bold;
+    border-radius: 4px;
+}
+.cad-category-G { background-color: #4CAF50; color: white; }
+.cad-category-Y { background-color: #FFEB3B; }
+.cad-category-R { background-color: #F44336; color: white; }
+""")
 
 def _create_text_matrix(table_data, table_id):
     """Create text matrix table (Table 4)"""
@@ -25,9 +41,7 @@ def _create_text_matrix(table_data, table_id):
         
         # Category label (G, Y, R)
         with cols[0]:
-            color_map = {'G': '#4CAF50', 'Y': '#FFEB3B', 'R': '#F44336'}
-            text_color = 'white' if category in ['G', 'R'] else 'black'
-            st.markdown(f"<div style='background-color: {color_map.get(category, '#ccc')}; color: {text_color}; padding: 10px; text-align: center; font-weight: bold; border-radius: 4px;'>{category}</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='cad-category cad-category-{category}'>{category}</div>", unsafe_allow_html=True)
         
         # Text cells for each column
         for col_idx, col_name in enumerate(['CC1', 'CC2', 'CC3']):
@@ -36,13 +50,14 @@ def _create_text_matrix(table_data, table_id):
                 cell_key = f"{table_id}_{row_idx}_{col_idx}"
                 
                 # Check if this cell is selected
-                selected_cell = st.session_state.selected_cells[table_id]['selected_cell']
+                selected_cell = get_selection().matrix_cell(table_id)
                 is_selected = selected_cell == (row_idx, col_idx)
                 
                 # Truncate text for button display
                 display_text = truncate_text(cell_text.replace('•', '').replace('\n', ' '), 60)
                 
-                if st.button(display_text, key=cell_key,
-                           type="primary" if is_selected else "secondary",
-                           help=cell_text):
-                    toggle_matrix_cell_selection(table_id, row_idx, col_idx, is_selected)
+                st.button(display_text, key=cell_key,
+                          type="primary" if is_selected else "secondary",
+                          help=cell_text,
+                          on_click=toggle_matrix_cell_selection,
+                          args=(table_id, row_idx, col_idx))
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+import streamlit as st
+
+from components.session import get_selection
+from components.table_model import Table, render_table
+from scoring.engine import LEVEL_CATEGORIES
+from scoring.selection import SelectionState
+from scoring.whatif import LEVEL_FIELDS, ranking_levels, what_if
+
+# Summary table column and range table of each compared level
+_LEVEL_COLUMNS = (
+    ('Development', 'development_level', 'development'),
+    ('Use', 'use_level', 'use'),
+    ('Support', 'support_level', 'support_evidence'),
+    ('Credibility Level', 'weighted_level', 'overall_credibility'),
+)
+
+def create_what_if_panel():
+    """Show which one- and two-factor changes move the phase or overall credibility levels"""
+    st.subheader("What-if analysis")
+    include_downgrades = st.checkbox("Include changes that lower a level", key="what_if_downgrades")
+    
+    selection = get_selection()
+    try:
+        outcomes = _what_if(selection.factor_code, include_downgrades)
+    except ValueError as error:
+        st.info(f"{error} to see what-if changes.")
+        return
+    
+    if not outcomes:
+        st.write("No single or double factor change moves a ranking level.")
+        return
+    
+    current = dict(zip(LEVEL_FIELDS, _ranking_levels(selection.factor_code)))
+    data = {'Change': [outcome.label for outcome in outcomes]}
+    for column, name, table_type in _LEVEL_COLUMNS:
+        data[column] = [_level_change(current[name], getattr(outcome, name), table_type)
+                        for outcome in outcomes]
+    render_table(Table.from_columns(data))
+
+@lru_cache(maxsize=1024)
+def _what_if(factor_code, include_downgrades):
+    """Cached what_if of the factor bits of a selection, shared by all sessions"""
+    return what_if(SelectionState(factor_code).assessment, include_downgrades=include_downgrades)
+
+@lru_cache(maxsize=1024)
+def _ranking_levels(factor_code):
+    return ranking_levels(SelectionState(factor_code).assessment)
+
+def _level_change(old, new, table_type):
+    """e.g. '3 → 2 (Acceptable)' for a changed level, '' for an unchanged one"""
+    if old == new:
+        return ''
+    return f"{old} → {new} ({LEVEL_CATEGORIES[table_type][new]})"
@@ -0,0 +1,43 @@
+"""
+Runtime options for the dashboard, read from environment variables.
+"""
+
+import os
+
+
+def _env_flag(name, default=False):
+    """Read a boolean option such as CREDIBILITY_PRECOMPUTE_LOOKUP=1"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# Precompute every Table 1 outcome at startup instead of on the first batch lookup
+# (saving assessments, Monte Carlo); the dashboard's summary tables do not use it
+PRECOMPUTE_LOOKUP = _env_flag('CREDIBILITY_PRECOMPUTE_LOOKUP')
+
+# How selectable tables are rendered: "component" (single bundled front-end
+# element per table) or "native" (one st.button per cell)
+RENDERER = os.environ.get('CREDIBILITY_RENDERER', 'component').strip().lower()
+
+# SQLite database the dashboard saves assessments to
+DB_PATH = os.environ.get('CREDIBILITY_DB_PATH', 'assessments.db')
+
+# Keep the selection in the query string instead of server-side session state,
+# so any replica can serve any rerun and selections can be shared by link
+URL_STATE = _env_flag('CREDIBILITY_URL_STATE')
+
+# Where session selections are kept: "session" (Streamlit session state),
+# "memory" (process-wide dictionary) or "sqlite:<path>" (file shared by replicas)
+STATE_BACKEND = os.environ.get('CREDIBILITY_STATE_BACKEND', 'session').strip()
+
+# Time each dashboard section on every rerun and show the timings in a sidebar
+PROFILE = _env_flag('CREDIBILITY_PROFILE')
+
+# Append section timings to this file: JSON Lines, or Prometheus text for *.prom / *.txt
+METRICS_FILE = os.environ.get('CREDIBILITY_METRICS_FILE', '').strip()
+
+# How the sections are laid out: "all" (every table on one page) or "sections"
+# (a section picker; only the chosen section is built and sent on a rerun)
+NAVIGATION = os.environ.get('CREDIBILITY_NAVIGATION', 'all').strip().lower()
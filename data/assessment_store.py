@@ -0,0 +1,375 @@
+"""
+SQLite-backed store of assessments and their derived scores.
+
+Every saved assessment keeps its nine factor metrics, the Table 2/3/4 cell
+selections and the scores and levels computed by the scoring engine, so
+portfolio queries such as "all Not credible results in program X" run on
+indexed columns without rescoring anything.
+
+The portfolio_counts table holds the number of assessments per project,
+phase levels, overall level, Table 3 risk color and Table 4 action. It is
+updated in the same transaction as every batch of inserts, so portfolio
+views read a few thousand aggregate rows instead of scanning assessments.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import fields
+from functools import lru_cache
+
+from data.table_data import get_table_data
+from scoring.batch import PHASE_TABLE_TYPES, UNRANKED, metrics_from_assessments
+from scoring.engine import Assessment
+from scoring.graph import table4_action
+from scoring.lookup import get_lookup_table
+from scoring.selection import MATRIX_TABLES, SelectionState
+
+FACTOR_FIELDS = tuple(field.name for field in fields(Assessment))
+RESULT_FIELDS = tuple(
+    f"{phase}_{suffix}" for phase, _ in PHASE_TABLE_TYPES for suffix in ("score", "level")
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    selection_code INTEGER,
+    {", ".join(f"{name} INTEGER" for name in FACTOR_FIELDS)},
+    {", ".join(f"{name}_cell TEXT" for name in MATRIX_TABLES)},
+    {", ".join(f"{name} {'REAL' if name.endswith('_score') else 'INTEGER'}" for name in RESULT_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_project_weighted
+    ON assessments (project, weighted_level);
+CREATE INDEX IF NOT EXISTS idx_assessments_project_not_weighted
+    ON assessments (project, not_weighted_level);
+CREATE INDEX IF NOT EXISTS idx_assessments_project_phases
+    ON assessments (project, development_level, use_level, support_level);
+CREATE INDEX IF NOT EXISTS idx_assessments_weighted
+    ON assessments (weighted_level);
+CREATE TABLE IF NOT EXISTS portfolio_counts (
+    project TEXT NOT NULL,
+    development_level INTEGER NOT NULL,
+    use_level INTEGER NOT NULL,
+    support_level INTEGER NOT NULL,
+    weighted_level INTEGER NOT NULL,
+    risk_color TEXT NOT NULL,
+    action TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (project, development_level, use_level, support_level, weighted_level, risk_color, action)
+);
+"""
+
+# Grouping columns of portfolio_counts; 0 / '' stand for unranked levels and unselected cells
+PORTFOLIO_KEYS = ("project", "development_level", "use_level", "support_level", "weighted_level",
+                  "risk_color", "action")
+_UPSERT_COUNTS = f"""
+INSERT INTO portfolio_counts ({", ".join(PORTFOLIO_KEYS)}, count) VALUES ({", ".join("?" * len(PORTFOLIO_KEYS))}, ?)
+ON CONFLICT ({", ".join(PORTFOLIO_KEYS)}) DO UPDATE SET count = count + excluded.count
+"""
+
+# Version of the portfolio_counts grouping (PRAGMA user_version); counts of an
+# older version are rebuilt from the assessments. Version 1: the action follows
+# the Table 3 risk color, as on the dashboard.
+_COUNTS_VERSION = 1
+
+# Result levels grouped in portfolio_counts
+_COUNTED_LEVELS = ("development_level", "use_level", "support_level", "weighted_level")
+
+_COLUMNS = ("project", "created_at", "selection_code") + FACTOR_FIELDS \
+    + tuple(f"{name}_cell" for name in MATRIX_TABLES) + RESULT_FIELDS
+_INSERT = f"INSERT INTO assessments ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections shared between threads"""
+
+    def __init__(self, path, size=4):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with block"""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        for _ in range(self.size):
+            self._connections.get().close()
+
+def _encode_cell(cell):
+    """Store a (row_idx, col_idx) matrix selection as JSON text"""
+    return None if cell is None else json.dumps(list(cell))
+
+def _decode_cell(text):
+    return None if text is None else tuple(json.loads(text))
+
+def risk_color(cell, table3=None):
+    """Table 3 color of a selected (row_idx, col_idx) cell, '' when unselected"""
+    if cell is None:
+        return ''
+    return (table3 or get_table_data("table3"))['data'][cell[0]][cell[1]]
+
+def recommended_action(color, cell, table4=None):
+    """
+    Table 4 action the dashboard recommends, e.g. 'Y / CC2'
+
+    Args:
+        color (str): Table 3 risk color, '' when unselected
+        cell (tuple or None): Selected Table 4 (row_idx, col_idx); only its column is used
+
+    Returns:
+        str: Risk category of the color and Table 4 column, '' without either
+    """
+    action = table4_action(table4 or get_table_data('table4'), color or None, cell)
+    return '' if action is None else f"{action[0]} / {action[1]}"
+
+def _portfolio_keys(records):
+    """
+    portfolio_counts grouping keys of (project, levels, matrix_cells) records
+
+    Returns:
+        Counter: Grouping key -> number of records
+    """
+    table3, table4 = get_table_data("table3"), get_table_data("table4")
+    counts = Counter()
+    for project, levels, matrix_cells in records:
+        color = risk_color(matrix_cells.get("table3"), table3)
+        key = (project,) + tuple(level or 0 for level in levels) \
+            + (color, recommended_action(color, matrix_cells.get("table4"), table4))
+        counts[key] += 1
+    return counts
+
+class AssessmentStore:
+    """
+    Persist assessments with their derived scores in a SQLite database
+
+    Writes are buffered and inserted in batches of batch_size rows, scored
+    together with the lookup table; call flush() to write pending rows. A
+    batch whose insert fails stays pending and is retried by the next flush.
+    """
+
+    def __init__(self, path, pool_size=4, batch_size=500):
+        """
+        Args:
+            path (str): SQLite database file
+            pool_size (int): Number of pooled connections
+            batch_size (int): Pending saves that trigger a batched insert
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pool = ConnectionPool(path, size=pool_size)
+        self._pending = []
+        self._lock = threading.Lock()
+        with self._pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(assessments)")}
+            if "selection_code" not in columns:
+                # Databases created before the packed selection column
+                connection.execute("ALTER TABLE assessments ADD COLUMN selection_code INTEGER")
+            if connection.execute("PRAGMA user_version").fetchone()[0] < _COUNTS_VERSION:
+                with connection:
+                    connection.execute("DELETE FROM portfolio_counts")
+                connection.execute(f"PRAGMA user_version = {_COUNTS_VERSION}")
+            self._backfill_portfolio_counts(connection)
+
+    def save(self, assessment, project, matrix_cells=None):
+        """
+        Queue one assessment for saving
+
+        Args:
+            assessment (Assessment): Selected factor metrics
+            project (str): Project / program the assessment belongs to
+            matrix_cells (dict): Optional table id -> (row_idx, col_idx) of Tables 2-4
+        """
+        with self._lock:
+            self._pending.append((assessment, project, dict(matrix_cells or {}), time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def save_many(self, assessments, project, matrix_cells=None):
+        """Queue several assessments of one project (see save)"""
+        for assessment in assessments:
+            self.save(assessment, project, matrix_cells)
+
+    def flush(self):
+        """Write all pending assessments in one transaction"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        # Rows stay pending until their transaction commits, so a failed
+        # write raises and the next flush retries them
+        pending = self._pending
+
+        result = get_lookup_table().lookup_batch(
+            metrics_from_assessments(assessment for assessment, _, _, _ in pending))
+        results = []
+        for name in RESULT_FIELDS:
+            values = getattr(result, name)
+            if name.endswith("_score"):
+                results.append([None if value != value else float(value) for value in values])
+            else:
+                results.append([None if value == UNRANKED else int(value) for value in values])
+
+        rows = []
+        level_columns = [results[RESULT_FIELDS.index(name)] for name in _COUNTED_LEVELS]
+        for idx, (assessment, project, matrix_cells, created_at) in enumerate(pending):
+            rows.append(
+                (project, created_at, SelectionState.from_assessment(assessment, matrix_cells).code)
+                + assessment.to_metrics()
+                + tuple(_encode_cell(matrix_cells.get(name)) for name in MATRIX_TABLES)
+                + tuple(column[idx] for column in results)
+            )
+        counts = _portfolio_keys(
+            (project, [column[idx] for column in level_columns], matrix_cells)
+            for idx, (_, project, matrix_cells, _) in enumerate(pending)
+        )
+        with self._pool.connection() as connection:
+            with connection:
+                connection.executemany(_INSERT, rows)
+                connection.executemany(_UPSERT_COUNTS, [key + (count,) for key, count in counts.items()])
+        self._pending = []
+
+    def _backfill_portfolio_counts(self, connection):
+        """Build portfolio_counts once for a database that predates it"""
+        if connection.execute("SELECT 1 FROM portfolio_counts LIMIT 1").fetchone() is not None:
+            return
+        counts = self._count_rows(connection, after_id=0)
+        with connection:
+            connection.executemany(_UPSERT_COUNTS, [key + (count,) for key, count in counts.items()])
+
+    @staticmethod
+    def _count_rows(connection, after_id):
+        """Grouping key counts of the assessments with an id above after_id"""
+        rows = connection.execute(
+            f"SELECT project, {', '.join(_COUNTED_LEVELS)}, table3_cell, table4_cell "
+            f"FROM assessments WHERE id > ?", (after_id,))
+        return _portfolio_keys(
+            (row["project"], [row[name] for name in _COUNTED_LEVELS],
+             {"table3": _decode_cell(row["table3_cell"]), "table4": _decode_cell(row["table4_cell"])})
+            for row in rows
+        )
+
+    def portfolio_counts(self):
+        """
+        Return the pre-aggregated assessment counts with the last assessment id they cover
+
+        Returns:
+            tuple: (Counter of PORTFOLIO_KEYS tuples -> count, last assessment id)
+        """
+        with self._pool.connection() as connection:
+            with connection:
+                # One read transaction: the counts and the id come from the same snapshot
+                connection.execute("BEGIN")
+                rows = connection.execute(f"SELECT {', '.join(PORTFOLIO_KEYS)}, count FROM portfolio_counts")
+                counts = Counter({tuple(row)[:-1]: row["count"] for row in rows})
+                last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM assessments").fetchone()[0]
+        return counts, last_id
+
+    def portfolio_counts_since(self, after_id):
+        """
+        Count only the assessments stored after after_id (see portfolio_counts)
+
+        Returns:
+            tuple: (Counter of the new assessments per grouping key, last assessment id)
+        """
+        with self._pool.connection() as connection:
+            with connection:
+                connection.execute("BEGIN")
+                last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM assessments").fetchone()[0]
+                if last_id <= after_id:
+                    return Counter(), after_id
+                counts = self._count_rows(connection, after_id)
+        return counts, last_id
+
+    def query(self, project=None, overall_level=None, weighted=True, development_level=None,
+              use_level=None, support_level=None, limit=None):
+        """
+        Return stored assessments matching all given filters, newest first
+
+        Args:
+            project (str): Project / program name
+            overall_level (int): Overall credibility level (4 = Not credible results)
+            weighted (bool): Filter on the weighted (default) or non-weighted level
+            development_level, use_level, support_level (int): Phase ranking levels
+            limit (int): Maximum number of rows
+
+        Returns:
+            list: One dict per assessment with its metrics, cells, scores and levels
+        """
+        conditions, params = self._conditions(project, overall_level, weighted,
+                                              development_level, use_level, support_level)
+        sql = "SELECT * FROM assessments"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._pool.connection() as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def count(self, project=None, overall_level=None, weighted=True, development_level=None,
+              use_level=None, support_level=None):
+        """Number of stored assessments matching the filters of query()"""
+        conditions, params = self._conditions(project, overall_level, weighted,
+                                              development_level, use_level, support_level)
+        sql = "SELECT COUNT(*) FROM assessments"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._pool.connection() as connection:
+            return connection.execute(sql, params).fetchone()[0]
+
+    @staticmethod
+    def _conditions(project, overall_level, weighted, development_level, use_level, support_level):
+        filters = {
+            "project": project,
+            "weighted_level" if weighted else "not_weighted_level": overall_level,
+            "development_level": development_level,
+            "use_level": use_level,
+            "support_level": support_level,
+        }
+        conditions = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        return conditions, params
+
+    @staticmethod
+    def _row_to_dict(row):
+        record = dict(row)
+        for name in MATRIX_TABLES:
+            record[f"{name}_cell"] = _decode_cell(record[f"{name}_cell"])
+        record["assessment"] = Assessment(*(record[name] for name in FACTOR_FIELDS))
+        if record["selection_code"] is not None:
+            record["selection"] = SelectionState(record["selection_code"])
+        return record
+
+    def close(self):
+        """Flush pending writes and close the pooled connections"""
+        try:
+            self.flush()
+        finally:
+            self._pool.close()
+
+@lru_cache(maxsize=None)
+def get_assessment_store(path):
+    """Return the process-wide store of a database file"""
+    return AssessmentStore(path)
@@ -0,0 +1,92 @@
+import copy
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from scoring.engine import DEFAULT_FRAMEWORK_DEFINITION
+from scoring.framework import FrameworkError, compile_framework
+
+# Directory holding one <framework_name>.json definition per assessment framework
+FRAMEWORKS_DIR = Path(os.environ.get('CREDIBILITY_FRAMEWORKS_DIR', Path(__file__).parent / "frameworks"))
+
+# The dashboard's own framework: always the definition scoring.engine was built from
+DEFAULT_FRAMEWORK = "default"
+
+_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Process-wide cache shared by all sessions and requests: name -> (mtime_ns, plan)
+_plan_cache = {}
+_cache_lock = threading.Lock()
+
+def list_frameworks():
+    """Return the names of all framework definitions in FRAMEWORKS_DIR and the default framework"""
+    return sorted({path.stem for path in FRAMEWORKS_DIR.glob("*.json")} | {DEFAULT_FRAMEWORK})
+
+def load_framework(name):
+    """
+    Parse a framework definition
+
+    Args:
+        name (str): Framework name (file name without .json)
+
+    Returns:
+        dict: The definition
+
+    Raises:
+        FrameworkError: If there is no such framework
+    """
+    if name == DEFAULT_FRAMEWORK:
+        return copy.deepcopy(DEFAULT_FRAMEWORK_DEFINITION)
+    path = _framework_path(name)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FrameworkError(f"Unknown framework '{name}', expected one of {list_frameworks()}") from None
+
+def get_scoring_plan(name=DEFAULT_FRAMEWORK):
+    """
+    Return the compiled scoring plan of a framework
+
+    Plans are compiled once and shared; a definition is read again only when
+    its file's mtime changes, and recompiled only when its content changed.
+    The default framework is compiled from the rules scoring.engine was
+    built from at import, so the service and the dashboard cannot disagree.
+
+    Args:
+        name (str): Framework name
+
+    Returns:
+        ScoringPlan: The compiled plan
+    """
+    if name == DEFAULT_FRAMEWORK:
+        return _default_plan()
+    path = _framework_path(name)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        raise FrameworkError(f"Unknown framework '{name}', expected one of {list_frameworks()}") from None
+
+    cached = _plan_cache.get(name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _cache_lock:
+        cached = _plan_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        plan = compile_framework(load_framework(name))
+        _plan_cache[name] = (mtime, plan)
+        return plan
+
+@lru_cache(maxsize=1)
+def _default_plan():
+    return compile_framework(DEFAULT_FRAMEWORK_DEFINITION)
+
+def _framework_path(name):
+    if not _NAME.match(name or ''):
+        raise FrameworkError(f"Invalid framework name '{name}'")
+    return FRAMEWORKS_DIR / f"{name}.json"
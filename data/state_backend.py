@@ -0,0 +1,196 @@
+"""
+Pluggable storage of per-session dashboard state.
+
+Streamlit keeps session state in the memory of the server process that owns
+the websocket, which ties a user to one replica. A state backend stores the
+values of a session under a session id the browser carries in its URL, so
+whichever replica serves a rerun can load them:
+
+- ``InProcessBackend``: a dictionary in the current process (single replica)
+- ``SQLiteBackend``: a SQLite file shared by replicas on the same host or
+  volume, with write-behind batching and a local read cache
+
+Values must be JSON serialisable.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+
+class StateBackend:
+    """Interface of the session state backends"""
+
+    def get(self, session_id, key, default=None):
+        """Return the value of key in a session, default when unset"""
+        raise NotImplementedError
+
+    def set(self, session_id, key, value):
+        """Store the value of key in a session"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Write pending changes (no-op for backends without write-behind)"""
+
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+
+class InProcessBackend(StateBackend):
+    """Session values in a dictionary of the current process"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id, key, default=None):
+        with self._lock:
+            return self._sessions.get(session_id, {}).get(key, default)
+
+    def set(self, session_id, key, value):
+        with self._lock:
+            self._sessions.setdefault(session_id, {})[key] = value
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_state (
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (session_id, key)
+);
+"""
+
+_UPSERT = """
+INSERT INTO session_state (session_id, key, value, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (session_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+"""
+
+
+class SQLiteBackend(StateBackend):
+    """
+    Session values in a SQLite file shared by several server processes
+
+    Reads load all values of a session with one query and keep them in a
+    local cache for cache_ttl seconds. Writes update the cache at once and
+    are written in batches by a background thread every flush_interval
+    seconds, so another replica sees a change after at most
+    flush_interval + cache_ttl seconds.
+    """
+
+    def __init__(self, path, flush_interval=0.2, cache_ttl=1.0, cache_size=1024):
+        """
+        Args:
+            path (str): SQLite database file
+            flush_interval (float): Seconds between write-behind batches
+            cache_ttl (float): Seconds a loaded session is served from the local cache
+            cache_size (int): Sessions kept in the local cache
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._cache = OrderedDict()  # session_id -> (loaded_at, values)
+        self._pending = {}  # (session_id, key) -> JSON text
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._writer = threading.Thread(target=self._write_behind, name="state-backend-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def get(self, session_id, key, default=None):
+        return self._session(session_id).get(key, default)
+
+    def set(self, session_id, key, value):
+        text = json.dumps(value)
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None:
+                entry[1][key] = value
+                self._cache.move_to_end(session_id)
+            self._pending[(session_id, key)] = text
+
+    def _session(self, session_id):
+        """Values of a session, from the local cache when fresh enough"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None and now - entry[0] < self.cache_ttl:
+                self._cache.move_to_end(session_id)
+                return entry[1]
+            rows = self._connection.execute(
+                "SELECT key, value FROM session_state WHERE session_id = ?", (session_id,)
+            ).fetchall()
+            values = {key: json.loads(value) for key, value in rows}
+            # Writes of this process not flushed yet win over the stored values
+            for (pending_id, key), text in self._pending.items():
+                if pending_id == session_id:
+                    values[key] = json.loads(text)
+            self._cache[session_id] = (now, values)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return values
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            now = time.time()
+            with self._connection:
+                self._connection.executemany(
+                    _UPSERT, [(session_id, key, text, now) for (session_id, key), text in pending.items()]
+                )
+
+    def _write_behind(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._writer.join()
+        self.flush()
+        self._connection.close()
+
+
+def open_state_backend(spec):
+    """
+    Create a backend from a specification string
+
+    Args:
+        spec (str): "memory" or "sqlite:<path>"
+
+    Returns:
+        StateBackend: The backend
+    """
+    if spec == "memory":
+        return InProcessBackend()
+    if spec.startswith("sqlite:"):
+        return SQLiteBackend(spec[len("sqlite:"):])
+    raise ValueError(f"Unknown state backend '{spec}', expected 'memory' or 'sqlite:<path>'")
+
+
+@lru_cache(maxsize=None)
+def get_state_backend(spec):
+    """
+    Return the process-wide backend of a specification string
+
+    The backend is closed at interpreter exit, so writes still waiting for
+    the write-behind thread are not lost on shutdown.
+    """
+    backend = open_state_backend(spec)
+    atexit.register(backend.close)
+    return backend
@@ -1,107 +1,99 @@
+import json
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+# Directory holding one <table_name>.json definition per table
+TABLES_DIR = Path(os.environ.get('CREDIBILITY_TABLES_DIR', Path(__file__).parent / "tables"))
+
+# Process-wide cache shared by all sessions: table name -> (mtime_ns, frozen table)
+_table_cache = {}
+_cache_lock = threading.Lock()
+
+_EMPTY_TABLE = MappingProxyType({})
+
+def _freeze(value):
+    """Recursively convert parsed JSON into read-only structures"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 def get_table_data(table_name):
     """
     Retrieve data for a specific table
     
+    Tables are parsed once from TABLES_DIR into frozen structures and shared
+    across sessions; a file is parsed again only when its mtime changes.
+    
     Args:
         table_name (str): Name of the table to retrieve
         
     Returns:
-        dict: Table data
+        mappingproxy: Read-only table data (empty for unknown tables)
     """
-    tables = {
-        "table1": {
-            'Metrics': [1, 2, 3],
-            'Data Pedigree': [
-                'All key data available with poor accuracy, precision and traceability (e.g scope, boundary conditions, drawings, ...)',
-                'All key data known. Significant data with acceptable accuracy, precision and traceability',
-                'All key data known with acceptable accuracy, precision and traceability'
-            ],
-            'Validation': [
-                'Expert judgment only\n\nConceptual model addresses problem statement\n\nComparison with measurements from similar systems or applications',
-                'Key simulation outputs agree with data from the component/system operating in a representative environment (e.g., rig test)\n\nRCA partly validated by measurement',
-                'Key simulation outputs agree with data from the component/system operating in a real environment (e.g. field test) over the full range of operation.\n\nRCA fully validated by measurement'
-            ],
-            'Code readiness only for in house software': [
-                'Expert judgment only\n\nMinimal testing of software elements',
-                'Some algorithms are tested to determine if they satisfy requirements\n\nSome features & capabilities are tested with benchmark solutions\n\nSome peer review conducted.',
-                'All algorithms are tested to determine if they satisfy requirements\n\nAll features and capabilities are tested with rigorous benchmark solutions\n\nIndependent peer review conducted'
-            ],
-            'Models': [
-                'Empirical models further specialized or calibrated to represent target',
-                'Physics-based model for some of most important processes.\n\nRepresentation and geometric fidelity: coarser without significant defeaturing',
-                'Established physics-based models\n\nRepresentation and geometric fidelity: High fidelity representation consistent with the "as built", with little to no defeaturing simplification'
-            ],
-            'Input pedigree': [
-                'All key data available with poor accuracy, precision (e.g operational data, ...)',
-                'All key data known. Significant data with acceptable accuracy, precision and traceability',
-                'All key data known with acceptable accuracy, precision and traceability'
-            ],
-            'Uncertainty': [
-                'Only deterministic analyses are conducted\n\nUncertainties in model results are not addressed',
-                'Most sources of uncertainty identified and, at best, qualitatively assessed. Uncertainty is assessed only for most important model results.\n\nMedium/moderate safety factor compensates results uncertainty',
-                'Uncertainty of results is provided quantitatively through propagation of the relevant uncertainty sources. High safety factor compensates results uncertainty'
-            ],
-            'Sensitivity': [
-                'Sensitivities of model input are not addressed. No clear identification of the main sources of uncertainty in the model outputs and the model inputs.\n\nQualitative estimates only for sensitivities in modelling and simulations',
-                'Sensitivities known for main parameters. Sensitivities of model input addressed. Correlation identified between uncertainty in the model outputs and the most important model inputs.',
-                'Sensitivities known for main parameters. Sensitivities of model input addressed. Correlation identified between uncertainty in the model outputs and all the model inputs.\n\nMost key sensitivities identified.'
-            ],
-            'History': [
-                'New model or major changes in model, or major differences in model use.',
-                'At most moderate changes in model and most moderate differences in model use.',
-                'At most minor changes in model and minor refinement in model use.'
-            ],
-            'Process development': [
-                'Ad hoc simulation only, no simulation guideline available',
-                'Calculation process defined',
-                'Calculation guideline done and methods understood'
-            ]
-        },
-        "table2": {
-            'row_labels': ['4', '3', '2', '1'],
-            'col_labels': ['1', '2', '3', '4'],
-            'row_title': 'DESIGN SOLUTION',
-            'col_title': 'M&S credibility / maturity',
-            'data': [
-                [2, 3, 4, 4],
-                [2, 2, 3, 4],
-                [1, 2, 2, 3],
-                [1, 1, 2, 2]
-            ]
-        },
-        "table3": {
-            'row_labels': ['1', '2', '3', '4'],
-            'col_labels': ['1', '2', '3', '4'],
-            'row_title': 'DECISION CONSEQUENCE',
-            'col_title': 'SIMULATION INFLUENCE',
-            'data': [
-                ['yellow', 'yellow', 'red', 'red'],
-                ['green', 'yellow', 'yellow', 'red'],
-                ['green', 'yellow', 'yellow', 'yellow'],
-                ['green', 'green', 'green', 'yellow']
-            ]
-        },
-        "table4": {
-            'categories': ['G', 'Y', 'R'],
-            'CC1': [
-                '• The risk of virtual validation is acceptable\n• Opportunities for improvement in M&S credibility',
-                '• Design solution to be validated by simulation and physical test\n• Improvement in M&S credibility\n• Skip of physical test with approval escalation for risk acceptance',
-                '• The risk of virtual validation implementation is not acceptable\n• M&S credibility to be improved'
-            ],
-            'CC2': [
-                '• The risk of virtual validation is acceptable',
-                '• Design solution to be validated by simulation and physical test\n• Opportunities for improvement in M&S credibility',
-                '• Design solution to be validated by simulations and physical test\n• M&S credibility to be improved'
-            ],
-            'CC3': [
-                '• The risk of virtual validation is acceptable',
-                '• The risk of virtual validation is acceptable\n• Opportunities for improvement in M&S credibility',
-                '• Skip of physical test with approval escalation for risk acceptance\n• Opportunities for improvement in M&S credibility'
-            ]
-        }
-    }
+    path = TABLES_DIR / f"{table_name}.json"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return _EMPTY_TABLE
     
-    return tables.get(table_name, {})
+    cached = _table_cache.get(table_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with _cache_lock:
+        cached = _table_cache.get(table_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, encoding="utf-8") as f:
+            table = _freeze(json.load(f))
+        _table_cache[table_name] = (mtime, table)
+        return table
+
+def get_matrix_shape(table_name):
+    """
+    Number of rows and columns of a matrix table
+
+    Table 4 has one row per risk category and one column per 'CC<n>' key;
+    Tables 2 and 3 have their row and column labels.
+
+    Args:
+        table_name (str): Name of the matrix table
+
+    Returns:
+        tuple: (rows, columns), (0, 0) for unknown tables
+    """
+    table_data = get_table_data(table_name)
+    if 'categories' in table_data:
+        return len(table_data['categories']), sum(1 for key in table_data if key.startswith('CC'))
+    return len(table_data.get('row_labels', ())), len(table_data.get('col_labels', ()))
+
+def check_matrix_cell(table_name, cell):
+    """
+    Check that a selected cell exists in a matrix table
+
+    Used for every cell that comes from outside the dashboard (URL tokens,
+    service requests), so they are validated the same way.
+
+    Args:
+        table_name (str): Name of the matrix table
+        cell (sequence): (row_idx, col_idx)
+
+    Returns:
+        tuple: The cell as (row_idx, col_idx)
+
+    Raises:
+        ValueError: If the cell is not a pair of integers within the table
+    """
+    rows, cols = get_matrix_shape(table_name)
+    if (not isinstance(cell, (list, tuple)) or len(cell) != 2
+            or not all(isinstance(idx, int) and not isinstance(idx, bool) for idx in cell)
+            or not (0 <= cell[0] < rows and 0 <= cell[1] < cols)):
+        raise ValueError(f"{table_name}: expected [row_idx, col_idx] within {rows} x {cols}, got {cell!r}")
+    return tuple(cell)
 
 def get_all_table_names():
     """Return list of all available table names"""
@@ -0,0 +1,3 @@
+from components.portfolio import render_portfolio
+
+render_portfolio()
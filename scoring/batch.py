@@ -0,0 +1,196 @@
+"""
+Vectorized batch scoring.
+
+Applies the rules of ``scoring.engine.score_assessment`` to whole arrays of
+assessments at once with NumPy. Rows are the nine Table 1 factors in
+``FACTOR_COLUMNS`` order; a metric of 0 means "not selected" (code readiness
+may be left at 0 to score development on three factors).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring.engine import (
+    DEVELOPMENT_DIVISOR_NO_CODE,
+    DEVELOPMENT_DIVISOR_WITH_CODE,
+    FACTOR_COLUMNS,
+    FACTOR_MAX_METRICS,
+    OVERALL_DIVISOR,
+    SUPPORT_DIVISOR,
+    SUPPORT_WEIGHT,
+    USE_DIVISOR,
+    CREDIBILITY_CLASSIFIER,
+    NO_CODE,
+    WITH_CODE,
+)
+
+# Column indices of the factors in a metrics row
+DATA_PEDIGREE, VALIDATION, CODE_READINESS, MODELS = 0, 1, 2, 3
+INPUT_PEDIGREE, UNCERTAINTY, SENSITIVITY = 4, 5, 6
+HISTORY, PROCESS = 7, 8
+
+# BatchResult score/level prefixes and the range table that ranks each of them
+PHASE_TABLE_TYPES = (
+    ('development', 'development'),
+    ('use', 'use'),
+    ('support', 'support_evidence'),
+    ('not_weighted', 'overall_credibility'),
+    ('weighted', 'overall_credibility'),
+)
+
+# Level 0 marks a phase (or overall credibility) that could not be ranked
+UNRANKED = 0
+
+
+class BatchResult(NamedTuple):
+    """Per-row scores (NaN when missing) and ranking levels (0 when unranked)"""
+    development_score: np.ndarray
+    use_score: np.ndarray
+    support_score: np.ndarray
+    development_level: np.ndarray
+    use_level: np.ndarray
+    support_level: np.ndarray
+    not_weighted_score: np.ndarray
+    weighted_score: np.ndarray
+    not_weighted_level: np.ndarray
+    weighted_level: np.ndarray
+    has_code_readiness: np.ndarray
+
+
+def as_metrics_array(metrics, columns=FACTOR_COLUMNS, max_metrics=FACTOR_MAX_METRICS):
+    """
+    Validate input and normalise it to an (N x factors) int8 array with 0 for unselected factors
+
+    Values are checked before the cast, so out of range metrics cannot wrap
+    around or be truncated into valid ones.
+
+    Args:
+        metrics (array-like): (N x factors) metrics; 0, None or NaN mean unselected
+        columns (sequence): Factor names, in column order
+        max_metrics (sequence): Highest metric of each factor
+
+    Returns:
+        numpy.ndarray: (N x factors) int8 array
+
+    Raises:
+        ValueError: On a wrong shape, or metrics that are not whole numbers between 0 and the factor's maximum
+    """
+    array = np.asarray(metrics)
+    if array.dtype == object:
+        try:
+            array = np.where(np.equal(array, None), np.nan, array).astype(np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Metrics must be numbers or None") from None
+    elif array.dtype.kind not in 'biuf':
+        raise ValueError(f"Metrics must be numbers, got {array.dtype}")
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    if array.ndim != 2 or array.shape[1] != len(columns):
+        raise ValueError(f"Expected an (N x {len(columns)}) array, got shape {array.shape}")
+    if array.dtype.kind == 'f':
+        array = np.nan_to_num(array, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    invalid = invalid_metrics(array, max_metrics)
+    if invalid.any():
+        row_idx, col_idx = np.argwhere(invalid)[0]
+        raise ValueError(f"{columns[col_idx]}: metric must be a whole number between 0 and "
+                         f"{max_metrics[col_idx]}, got {array[row_idx, col_idx].item()!r} in row {row_idx}")
+    return array.astype(np.int8, copy=False)
+
+
+def invalid_metrics(array, max_metrics=FACTOR_MAX_METRICS):
+    """
+    Mask of the metrics that are not whole numbers between 0 and their factor's maximum
+
+    Args:
+        array (numpy.ndarray): (N x factors) numeric metrics, NaN for unselected
+        max_metrics (sequence): Highest metric of each factor
+
+    Returns:
+        numpy.ndarray: (N x factors) bool mask, True for invalid metrics
+    """
+    if array.dtype.kind == 'f':
+        array = np.nan_to_num(array, nan=0.0, posinf=np.inf, neginf=-np.inf)
+        invalid = array != np.floor(array)
+    else:
+        invalid = np.zeros(array.shape, dtype=bool)
+    return invalid | (array < 0) | (array > np.asarray(max_metrics))
+
+
+def metrics_from_assessments(assessments):
+    """Build an (N x 9) metrics array from an iterable of Assessment objects"""
+    rows = [[value or 0 for value in assessment.to_metrics()] for assessment in assessments]
+    return np.array(rows, dtype=np.int8).reshape(-1, len(FACTOR_COLUMNS))
+
+
+def _product_score(metrics, columns, divisor):
+    """Product of the given columns divided by divisor, NaN where any is missing"""
+    selected = metrics[:, columns].astype(np.int64)
+    product = selected.prod(axis=1)
+    return np.where((selected > 0).all(axis=1), product / divisor, np.nan)
+
+
+def _classify(scores, table_types, has_code):
+    """
+    Classify columns of scores in one pass with the compiled range tables
+
+    Args:
+        scores (numpy.ndarray): (N x K) scores, NaN when missing
+        table_types (sequence): Range table type of each of the K columns
+        has_code (numpy.ndarray): (N,) whether each row assessed code readiness
+
+    Returns:
+        numpy.ndarray: (N x K) int8 levels, UNRANKED for missing or zero scores
+    """
+    with_code = [CREDIBILITY_CLASSIFIER.slot(table_type, WITH_CODE) for table_type in table_types]
+    no_code = [CREDIBILITY_CLASSIFIER.slot(table_type, NO_CODE) for table_type in table_types]
+    slots = np.where(has_code[:, None], with_code, no_code)
+    # A zero score is unranked, like in get_ranking_level
+    scores = np.where(scores == 0, np.nan, scores)
+    return CREDIBILITY_CLASSIFIER.classify_array(scores, slots, unranked=UNRANKED)
+
+
+def score_batch(metrics):
+    """
+    Score many assessments at once with the same rules as score_assessment
+
+    Args:
+        metrics (array-like): (N x 9) metrics in FACTOR_COLUMNS order, 0 for unselected
+
+    Returns:
+        BatchResult: Phase scores, ranking levels and overall credibility per row
+    """
+    metrics = as_metrics_array(metrics)
+    has_code = metrics[:, CODE_READINESS] > 0
+
+    dev_score = np.where(
+        has_code,
+        _product_score(metrics, [DATA_PEDIGREE, VALIDATION, CODE_READINESS, MODELS],
+                       DEVELOPMENT_DIVISOR_WITH_CODE),
+        _product_score(metrics, [DATA_PEDIGREE, VALIDATION, MODELS], DEVELOPMENT_DIVISOR_NO_CODE),
+    )
+    use_score = _product_score(metrics, [INPUT_PEDIGREE, UNCERTAINTY, SENSITIVITY], USE_DIVISOR)
+    support_score = _product_score(metrics, [HISTORY, PROCESS], SUPPORT_DIVISOR)
+
+    phase_levels = _classify(np.stack([dev_score, use_score, support_score], axis=1),
+                             ["development", "use", "support_evidence"], has_code)
+    dev_level, use_level, support_level = phase_levels.T
+
+    not_weighted_score = _product_score(phase_levels, [0, 1, 2], OVERALL_DIVISOR)
+    weighted_score = not_weighted_score * SUPPORT_WEIGHT
+    overall_levels = _classify(np.stack([not_weighted_score, weighted_score], axis=1),
+                               ["overall_credibility", "overall_credibility"], has_code)
+
+    return BatchResult(
+        development_score=dev_score,
+        use_score=use_score,
+        support_score=support_score,
+        development_level=dev_level,
+        use_level=use_level,
+        support_level=support_level,
+        not_weighted_score=not_weighted_score,
+        weighted_score=weighted_score,
+        not_weighted_level=overall_levels[:, 0],
+        weighted_level=overall_levels[:, 1],
+        has_code_readiness=has_code,
+    )
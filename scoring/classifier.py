@@ -0,0 +1,156 @@
+"""
+Compiled interval classifier for the credibility range tables.
+
+A range table is a list of bands ``{"range": (min, max), "category", "level"}``.
+Compiling checks once that the bands are contiguous and do not overlap, then
+classifies scores by bisecting the sorted upper bounds: a score belongs to the
+first band whose (inclusive) upper bound is not below it. Scalars go through
+``bisect``; arrays of scores for any mix of tables are classified in a single
+vectorized pass.
+"""
+
+from bisect import bisect_left
+
+# Level stored in the padding column of the compiled arrays
+_PADDING_LEVEL = -1
+
+
+class RangeTableError(ValueError):
+    """Raised when a range table has gaps, overlaps or empty bands"""
+
+
+class IntervalClassifier:
+    """One validated range table, classified by bisecting its upper bounds"""
+
+    def __init__(self, bands, name=''):
+        """
+        Args:
+            bands (list): Band dicts with "range", "category" and "level" keys
+            name (str): Table name used in error messages
+        """
+        if not bands:
+            raise RangeTableError(f"Range table '{name}' has no bands")
+
+        ordered = sorted(bands, key=lambda band: band["range"][0])
+        for band in ordered:
+            min_val, max_val = band["range"]
+            if not min_val < max_val:
+                raise RangeTableError(f"Range table '{name}' has an empty band {band['range']}")
+        for previous, band in zip(ordered, ordered[1:]):
+            if band["range"][0] > previous["range"][1]:
+                raise RangeTableError(
+                    f"Range table '{name}' has a gap between {previous['range']} and {band['range']}")
+            if band["range"][0] < previous["range"][1]:
+                raise RangeTableError(
+                    f"Range table '{name}' has overlapping bands {previous['range']} and {band['range']}")
+
+        self.name = name
+        self.lower = ordered[0]["range"][0]
+        self.upper = ordered[-1]["range"][1]
+        self.upper_bounds = tuple(band["range"][1] for band in ordered)
+        self.levels = tuple(band["level"] for band in ordered)
+        self.categories = tuple(band["category"] for band in ordered)
+
+    def band_index(self, score):
+        """Index of the band containing score, or None when out of range"""
+        if not self.lower <= score <= self.upper:
+            return None
+        return bisect_left(self.upper_bounds, score)
+
+    def classify(self, score):
+        """
+        Classify one score
+
+        Args:
+            score (float): Score to classify
+
+        Returns:
+            tuple or None: (level, category), None when the score is out of range
+        """
+        index = self.band_index(score)
+        if index is None:
+            return None
+        return self.levels[index], self.categories[index]
+
+
+class CompiledRanges:
+    """
+    Range tables of several variants (e.g. with and without code readiness)
+
+    Every (variant, table type) pair gets a slot so that mixed arrays of
+    scores can be classified in one vectorized pass.
+    """
+
+    def __init__(self, ranges_by_variant):
+        """
+        Args:
+            ranges_by_variant (dict): Variant key -> table type -> list of bands
+        """
+        self.variants = tuple(ranges_by_variant)
+        self.table_types = tuple(next(iter(ranges_by_variant.values())))
+        self._classifiers = {}
+        for variant, ranges in ranges_by_variant.items():
+            if tuple(ranges) != self.table_types:
+                raise RangeTableError(f"Variant '{variant}' does not define the same range tables")
+            for table_type, bands in ranges.items():
+                self._classifiers[variant, table_type] = IntervalClassifier(
+                    bands, name=f"{table_type} ({variant})")
+        self._arrays = None
+
+    def classifier(self, variant, table_type):
+        """Return the IntervalClassifier of one table"""
+        return self._classifiers[variant, table_type]
+
+    def classify(self, score, table_type, variant):
+        """Classify one score, returning (level, category) or None"""
+        return self._classifiers[variant, table_type].classify(score)
+
+    def slot(self, table_type, variant):
+        """Slot number of a table for classify_array"""
+        return (self.variants.index(variant) * len(self.table_types)
+                + self.table_types.index(table_type))
+
+    def _compiled_arrays(self):
+        """Per-slot lower bounds, upper bounds and levels as padded NumPy arrays"""
+        if self._arrays is None:
+            import numpy as np
+
+            classifiers = [self._classifiers[variant, table_type]
+                           for variant in self.variants for table_type in self.table_types]
+            # One extra +inf column catches scores above a table's upper bound
+            width = max(len(classifier.upper_bounds) for classifier in classifiers) + 1
+            lowers = np.array([classifier.lower for classifier in classifiers])
+            uppers = np.full((len(classifiers), width), np.inf)
+            levels = np.full((len(classifiers), width), _PADDING_LEVEL, dtype=np.int16)
+            for slot, classifier in enumerate(classifiers):
+                count = len(classifier.upper_bounds)
+                uppers[slot, :count] = classifier.upper_bounds
+                levels[slot, :count] = classifier.levels
+            self._arrays = lowers, uppers, levels
+        return self._arrays
+
+    def classify_array(self, scores, slots, unranked=0):
+        """
+        Classify an array of scores, each against the table of its slot
+
+        Args:
+            scores (numpy.ndarray): Scores, NaN when missing
+            slots (numpy.ndarray): Slot number per score (broadcast against scores)
+            unranked (int): Level used for missing and out-of-range scores
+
+        Returns:
+            numpy.ndarray: int8 levels with the shape of scores
+        """
+        import numpy as np
+
+        lowers, uppers, levels = self._compiled_arrays()
+        scores = np.asarray(scores, dtype=np.float64)
+        slots = np.broadcast_to(slots, scores.shape)
+
+        # Counting upper bounds below the score is bisect_left on each slot's table
+        index = np.zeros(scores.shape, dtype=np.intp)
+        for column in range(uppers.shape[1] - 1):
+            index += scores > uppers[:, column][slots]
+        ranked = levels[slots, index]
+        in_range = (scores >= lowers[slots]) & (ranked != _PADDING_LEVEL)
+        return np.where(in_range, ranked, unranked).astype(np.int8)
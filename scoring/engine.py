@@ -0,0 +1,367 @@
+"""
+Headless credibility scoring engine.
+
+Holds the scoring rules behind the dashboard summary tables (phase scores,
+ranking levels and the overall credibility level) without any Streamlit
+dependency, so they can be used from batch jobs, services and tests as well
+as from ``components.summary_table``.
+"""
+
+import json
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+from scoring.classifier import CompiledRanges
+
+# The dashboard's assessment framework. It is the single definition of the
+# scoring rules: data/frameworks.py compiles the same file for the scoring service.
+DEFAULT_FRAMEWORK_PATH = Path(__file__).resolve().parent.parent / "data" / "frameworks" / "default.json"
+
+# What the scoring code implements (score_assessment, scoring.batch, scoring.graph,
+# scoring.improvement): phase, range table and factor keys of each phase, in order.
+# The definition in DEFAULT_FRAMEWORK_PATH may change divisors, support weight and
+# ranges, but not this layout.
+PHASE_LAYOUT = (
+    ("development", "development", ("data_pedigree", "validation", "code_readiness", "models")),
+    ("use", "use", ("input_pedigree", "uncertainty", "sensitivity")),
+    ("support", "support_evidence", ("history", "process")),
+)
+OPTIONAL_FACTOR = "code_readiness"
+METRIC_LEVELS = 3
+
+
+def framework_problems(definition):
+    """
+    List what in a framework definition the engine cannot honour
+
+    Args:
+        definition (dict): Framework definition (see data/frameworks/default.json)
+
+    Returns:
+        list: Human readable problems (empty when the engine scores it as scoring.framework does)
+    """
+    problems = []
+    expected_phase = {key: phase for phase, _, keys in PHASE_LAYOUT for key in keys}
+    factors = definition.get('factors', [])
+    keys = tuple(factor.get('key') for factor in factors)
+    if keys != tuple(expected_phase):
+        problems.append(f"factors must be {', '.join(expected_phase)} in this order, got {keys}")
+    for factor in factors:
+        key = factor.get('key')
+        if key in expected_phase and factor.get('phase') != expected_phase[key]:
+            problems.append(f"factor {key} must be in phase {expected_phase[key]}")
+        if factor.get('metrics', METRIC_LEVELS) != METRIC_LEVELS:
+            problems.append(f"factor {key} must have {METRIC_LEVELS} metrics")
+        if bool(factor.get('optional')) != (key == OPTIONAL_FACTOR):
+            problems.append(f"only {OPTIONAL_FACTOR} can be optional, and it must be")
+
+    phases = definition.get('phases', [])
+    if tuple(phase.get('name') for phase in phases) != tuple(name for name, _, _ in PHASE_LAYOUT):
+        problems.append(f"phases must be {', '.join(name for name, _, _ in PHASE_LAYOUT)} in this order")
+    else:
+        for phase, (name, table_type, _) in zip(phases, PHASE_LAYOUT):
+            if phase.get('table_type', name) != table_type:
+                problems.append(f"phase {name} must be ranked by the {table_type} ranges")
+            if name != 'support' and phase.get('weight', 1.0) != 1.0:
+                problems.append(f"only the support phase can be weighted, {name} has weight {phase['weight']}")
+            if 'divisor' not in phase:
+                problems.append(f"phase {name} needs an explicit divisor")
+        if 'divisor_without_optional' not in phases[0]:
+            problems.append("phase development needs an explicit divisor_without_optional")
+
+    overall = definition.get('overall', {})
+    if overall.get('table_type', 'overall_credibility') != 'overall_credibility' or 'divisor' not in overall:
+        problems.append("overall needs the overall_credibility ranges and an explicit divisor")
+    table_types = {table_type for _, table_type, _ in PHASE_LAYOUT} | {'overall_credibility'}
+    for ranges in ('ranges', 'ranges_without_optional'):
+        missing = table_types - set(definition.get(ranges, {}))
+        if missing:
+            problems.append(f"{ranges} misses {', '.join(sorted(missing))}")
+    return problems
+
+
+with open(DEFAULT_FRAMEWORK_PATH, encoding="utf-8") as _f:
+    DEFAULT_FRAMEWORK_DEFINITION = json.load(_f)
+_problems = framework_problems(DEFAULT_FRAMEWORK_DEFINITION)
+if _problems:
+    raise ValueError(f"{DEFAULT_FRAMEWORK_PATH} does not fit the scoring engine: " + "; ".join(_problems))
+_PHASES = {phase['name']: phase for phase in DEFAULT_FRAMEWORK_DEFINITION['phases']}
+
+# Table 1 columns in display order (Data Pedigree through Process development)
+FACTOR_COLUMNS = tuple(factor['column'] for factor in DEFAULT_FRAMEWORK_DEFINITION['factors'])
+
+# Highest metric level of each factor, in FACTOR_COLUMNS order
+FACTOR_MAX_METRICS = (METRIC_LEVELS,) * len(FACTOR_COLUMNS)
+
+# Column mapping from the selectable table to the summary tables
+COLUMN_MAPPING = {
+    factor['column']: (factor['phase'], factor['label'])
+    for factor in DEFAULT_FRAMEWORK_DEFINITION['factors']
+}
+
+# Divisors normalising each product of metrics to the 0..1 range
+DEVELOPMENT_DIVISOR_WITH_CODE = _PHASES['development']['divisor']
+DEVELOPMENT_DIVISOR_NO_CODE = _PHASES['development']['divisor_without_optional']
+USE_DIVISOR = _PHASES['use']['divisor']
+SUPPORT_DIVISOR = _PHASES['support']['divisor']
+OVERALL_DIVISOR = DEFAULT_FRAMEWORK_DEFINITION['overall']['divisor']
+SUPPORT_WEIGHT = _PHASES['support'].get('weight', 1.0)
+
+# Credibility ranges for determining ranking levels. Bands must be contiguous:
+# a score belongs to the first band whose upper bound is not below it.
+CREDIBILITY_RANGES_WITH_CODE = DEFAULT_FRAMEWORK_DEFINITION['ranges']
+CREDIBILITY_RANGES_NO_CODE = DEFAULT_FRAMEWORK_DEFINITION['ranges_without_optional']
+
+# Range table variants, compiled and validated once at import
+WITH_CODE, NO_CODE = 'with_code', 'no_code'
+CREDIBILITY_CLASSIFIER = CompiledRanges({
+    WITH_CODE: CREDIBILITY_RANGES_WITH_CODE,
+    NO_CODE: CREDIBILITY_RANGES_NO_CODE,
+})
+
+# Category name of each level per table type (the same in both variants)
+LEVEL_CATEGORIES = {
+    table_type: {band['level']: band['category'] for band in bands}
+    for table_type, bands in CREDIBILITY_RANGES_WITH_CODE.items()
+}
+
+
+def code_variant(has_code_readiness):
+    """Return the range table variant for an assessment with or without code readiness"""
+    return WITH_CODE if has_code_readiness else NO_CODE
+
+
+def empty_summary_data():
+    """Return the initial (empty) summary data layout kept in session state"""
+    return {
+        'development': {'Data Pedigree': '', 'Validation': '', 'Code Readiness': '', 'Models': ''},
+        'use': {'Input Pedigree': '', 'Uncertainty': '', 'Sensitivity': ''},
+        'support': {'History': '', 'Process': ''}
+    }
+
+
+def _parse_metric(value):
+    """Convert a stored metric ('', None, '2', 2) to an int or None"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class Assessment:
+    """Metric levels (1-3) selected for the nine Table 1 factors.
+
+    A factor that has not been selected is None. Code readiness is optional:
+    when it is None the development phase is scored on three factors.
+    """
+    data_pedigree: Optional[int] = None
+    validation: Optional[int] = None
+    code_readiness: Optional[int] = None
+    models: Optional[int] = None
+    input_pedigree: Optional[int] = None
+    uncertainty: Optional[int] = None
+    sensitivity: Optional[int] = None
+    history: Optional[int] = None
+    process: Optional[int] = None
+
+    @classmethod
+    def from_metrics(cls, metrics):
+        """
+        Build an assessment from nine metrics in FACTOR_COLUMNS order
+
+        Args:
+            metrics (sequence): Nine metric values (int, str or None/'' when unselected)
+
+        Returns:
+            Assessment: The typed assessment
+        """
+        if len(metrics) != len(FACTOR_COLUMNS):
+            raise ValueError(f"Expected {len(FACTOR_COLUMNS)} metrics, got {len(metrics)}")
+        return cls(*(_parse_metric(value) for value in metrics))
+
+    @classmethod
+    def from_summary_data(cls, summary_data):
+        """
+        Build an assessment from the ``summary_data`` session state layout
+
+        Args:
+            summary_data (dict): Phase -> summary column -> metric string
+
+        Returns:
+            Assessment: The typed assessment
+        """
+        metrics = []
+        for col in FACTOR_COLUMNS:
+            table_name, summary_col = COLUMN_MAPPING[col]
+            metrics.append(summary_data.get(table_name, {}).get(summary_col, ''))
+        return cls.from_metrics(metrics)
+
+    def to_metrics(self):
+        """Return the nine metrics as a tuple in FACTOR_COLUMNS order"""
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def to_summary_data(self):
+        """Return the assessment in the ``summary_data`` session state layout"""
+        summary_data = empty_summary_data()
+        for col, value in zip(FACTOR_COLUMNS, self.to_metrics()):
+            table_name, summary_col = COLUMN_MAPPING[col]
+            summary_data[table_name][summary_col] = '' if value is None else str(value)
+        return summary_data
+
+    @property
+    def has_code_readiness(self):
+        return self.code_readiness is not None
+
+
+# Assessment fields follow PHASE_LAYOUT, like the factors of the default framework
+assert tuple(field.name for field in fields(Assessment)) \
+    == tuple(key for _, _, keys in PHASE_LAYOUT for key in keys)
+
+
+@dataclass(frozen=True)
+class RankingResult:
+    """Score of a phase (or of the overall credibility) and its ranking level"""
+    score: Optional[float] = None
+    level: Optional[int] = None
+    category: str = ''
+
+    @property
+    def label(self):
+        """Ranking level as shown in the summary tables, e.g. '1 (Advanced)'"""
+        if self.level is None:
+            return ''
+        return f"{self.level} ({self.category})"
+
+
+@dataclass(frozen=True)
+class CredibilityResult:
+    """Phase scores, ranking levels and overall credibility of an assessment"""
+    development: RankingResult
+    use: RankingResult
+    support: RankingResult
+    not_weighted: RankingResult
+    weighted: RankingResult
+    has_code_readiness: bool
+
+    @property
+    def weighted_support_level(self):
+        """Support ranking level multiplied by the support weight"""
+        if self.support.level is None:
+            return None
+        return self.support.level * SUPPORT_WEIGHT
+
+
+def calculate_score(*values, divisor):
+    """
+    Multiply metric values and normalise the product by divisor
+
+    Args:
+        *values: Metric values (int or numeric strings)
+        divisor (int): Normalisation divisor
+
+    Returns:
+        float or None: The score, or None if any value is missing
+    """
+    if not all(values) or any(val == '' for val in values):
+        return None
+    try:
+        product = 1
+        for val in values:
+            product *= int(val)
+        return product / divisor
+    except (ValueError, TypeError, ZeroDivisionError):
+        return None
+
+
+def get_credibility_ranges(has_code_readiness):
+    """Return the range table that applies with or without code readiness"""
+    return CREDIBILITY_RANGES_WITH_CODE if has_code_readiness else CREDIBILITY_RANGES_NO_CODE
+
+
+def get_ranking_level(score, table_type, has_code_readiness):
+    """
+    Determine ranking level based on score and table type
+
+    Args:
+        score (float or None): Phase or overall score
+        table_type (str): development, use, support_evidence or overall_credibility
+        has_code_readiness (bool): Whether code readiness was assessed
+
+    Returns:
+        RankingResult: Score with its level and category (level None when unranked)
+    """
+    if not score:
+        return RankingResult(score=score)
+
+    try:
+        score_float = float(score)
+    except (ValueError, TypeError):
+        return RankingResult()
+
+    ranking = CREDIBILITY_CLASSIFIER.classify(score_float, table_type,
+                                              code_variant(has_code_readiness))
+    if ranking is None:
+        return RankingResult(score=score_float)
+    level, category = ranking
+    return RankingResult(score_float, level, category)
+
+
+def extract_level_number(ranking_level):
+    """Extract the numeric level from ranking level string like '1 (Advanced)'"""
+    if not ranking_level or ranking_level == '':
+        return None
+    try:
+        return int(ranking_level.split(' ')[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def score_assessment(assessment):
+    """
+    Score an assessment the same way the dashboard summary tables do
+
+    Args:
+        assessment (Assessment): Selected factor metrics
+
+    Returns:
+        CredibilityResult: Phase scores, ranking levels and overall credibility
+    """
+    has_code = assessment.has_code_readiness
+
+    if has_code:
+        dev_score = calculate_score(assessment.data_pedigree, assessment.validation,
+                                    assessment.code_readiness, assessment.models,
+                                    divisor=DEVELOPMENT_DIVISOR_WITH_CODE)
+    else:
+        dev_score = calculate_score(assessment.data_pedigree, assessment.validation,
+                                    assessment.models, divisor=DEVELOPMENT_DIVISOR_NO_CODE)
+    use_score = calculate_score(assessment.input_pedigree, assessment.uncertainty,
+                                assessment.sensitivity, divisor=USE_DIVISOR)
+    support_score = calculate_score(assessment.history, assessment.process,
+                                    divisor=SUPPORT_DIVISOR)
+
+    development = get_ranking_level(dev_score, "development", has_code)
+    use = get_ranking_level(use_score, "use", has_code)
+    support = get_ranking_level(support_score, "support_evidence", has_code)
+
+    not_weighted_score = calculate_score(development.level, use.level, support.level,
+                                         divisor=OVERALL_DIVISOR)
+    weighted_score = not_weighted_score * SUPPORT_WEIGHT if not_weighted_score else None
+
+    return CredibilityResult(
+        development=development,
+        use=use,
+        support=support,
+        not_weighted=get_ranking_level(not_weighted_score, "overall_credibility", has_code),
+        weighted=get_ranking_level(weighted_score, "overall_credibility", has_code),
+        has_code_readiness=has_code,
+    )
+
+
+def score_summary_data(summary_data):
+    """Score the ``summary_data`` session state layout (see score_assessment)"""
+    return score_assessment(Assessment.from_summary_data(summary_data))
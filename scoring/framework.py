@@ -0,0 +1,296 @@
+"""
+Declarative assessment frameworks compiled into scoring plans.
+
+A framework describes an assessment as data: its factors (Table 1 columns
+with their metric range and phase), its phases with divisors and weights,
+the overall divisor and the credibility range tables. One factor may be
+optional, like code readiness: rows without it use the phase divisors and
+range tables "without optional". ``data/frameworks/default.json`` is the
+dashboard's own nine-factor framework.
+
+``compile_framework`` turns a definition into a ``ScoringPlan`` once: factor
+index arrays per phase, divisor and weight arrays, a compiled range
+classifier and, for frameworks small enough, lookup arrays holding the
+result of every complete selection. Plans are cached by a hash of the
+definition, so selecting a framework at runtime costs a dictionary lookup.
+
+Scores follow the rules of ``scoring.engine``: a phase score is the product
+of its metrics over the divisor, the not weighted overall score the product
+of the phase levels over the overall divisor, and the weighted score that
+times the product of the phase weights.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring.batch import as_metrics_array
+from scoring.classifier import CompiledRanges
+
+WITH_OPTIONAL, WITHOUT_OPTIONAL = 'with_optional', 'without_optional'
+OVERALL_COLUMNS = ('not_weighted', 'weighted')
+
+# Level 0 marks a phase (or overall credibility) that could not be ranked
+UNRANKED = 0
+
+# Largest number of complete selections precomputed into lookup arrays
+MAX_LOOKUP_SIZE = 1 << 22
+
+
+class FrameworkError(ValueError):
+    """Raised for an invalid framework definition"""
+
+
+class PlanResult(NamedTuple):
+    """Per-row scores (NaN when missing) and levels (0 when unranked) of ScoringPlan.columns"""
+    scores: np.ndarray
+    levels: np.ndarray
+    has_optional: np.ndarray
+
+
+def framework_hash(definition):
+    """SHA-256 of the canonical JSON of a framework definition"""
+    return hashlib.sha256(_canonical(definition).encode('utf-8')).hexdigest()
+
+
+def _canonical(definition):
+    return json.dumps(definition, sort_keys=True, separators=(',', ':'))
+
+
+def compile_framework(definition):
+    """
+    Compile a framework definition into a scoring plan (cached by its hash)
+
+    Args:
+        definition (dict): Framework definition (see data/frameworks/default.json)
+
+    Returns:
+        ScoringPlan: The compiled plan
+
+    Raises:
+        FrameworkError: If the definition is inconsistent
+    """
+    text = _canonical(definition)
+    return _compile(hashlib.sha256(text.encode('utf-8')).hexdigest(), text)
+
+
+@lru_cache(maxsize=32)
+def _compile(digest, text):
+    return ScoringPlan(json.loads(text), digest)
+
+
+class ScoringPlan:
+    """A framework compiled into arrays, ready for vectorized scoring"""
+
+    def __init__(self, definition, digest):
+        """
+        Args:
+            definition (dict): Framework definition
+            digest (str): Hash of the definition (see framework_hash)
+        """
+        self.name = definition.get('name', '')
+        self.hash = digest
+        try:
+            self._compile_factors(definition['factors'])
+            self._compile_phases(definition['phases'], definition.get('overall', {}))
+            self._compile_ranges(definition['ranges'], definition.get('ranges_without_optional'))
+        except KeyError as error:
+            raise FrameworkError(f"Framework '{self.name}' misses the key {error}") from None
+        self._compile_lookup()
+
+    def _compile_factors(self, factors):
+        if not factors:
+            raise FrameworkError(f"Framework '{self.name}' has no factors")
+        self.factor_columns = tuple(factor['column'] for factor in factors)
+        self.factor_keys = tuple(factor.get('key', factor['column']) for factor in factors)
+        self.factor_labels = tuple(factor.get('label', factor['column']) for factor in factors)
+        # Column and key of each factor -> factor index
+        self.column_index = {}
+        for idx, names in enumerate(zip(self.factor_columns, self.factor_keys)):
+            for name in names:
+                if self.column_index.setdefault(name, idx) != idx:
+                    raise FrameworkError(f"Framework '{self.name}' uses '{name}' for two factors")
+        self.max_metrics = np.array([factor.get('metrics', 3) for factor in factors], dtype=np.int64)
+        if (self.max_metrics < 1).any() or (self.max_metrics > 127).any():
+            raise FrameworkError(f"Framework '{self.name}': factor metrics must be between 1 and 127")
+        optional = [idx for idx, factor in enumerate(factors) if factor.get('optional')]
+        if len(optional) > 1:
+            raise FrameworkError(f"Framework '{self.name}': at most one factor can be optional")
+        self.optional_index = optional[0] if optional else None
+        self._factor_phases = [factor['phase'] for factor in factors]
+
+    def _compile_phases(self, phases, overall):
+        self.phase_names = tuple(phase['name'] for phase in phases)
+        unknown = set(self._factor_phases) - set(self.phase_names)
+        if unknown:
+            raise FrameworkError(f"Framework '{self.name}': factors refer to unknown phases "
+                                 f"{', '.join(sorted(unknown))}")
+        self.columns = self.phase_names + OVERALL_COLUMNS
+        overall_type = overall.get('table_type', 'overall_credibility')
+        self.table_types = tuple(phase.get('table_type', phase['name']) for phase in phases) \
+            + (overall_type, overall_type)
+
+        self._phase_indices = []
+        self._required = []
+        divisors = []
+        for phase in phases:
+            indices = np.array([idx for idx, name in enumerate(self._factor_phases) if name == phase['name']])
+            if not len(indices):
+                raise FrameworkError(f"Framework '{self.name}': phase '{phase['name']}' has no factors")
+            required = indices != self.optional_index
+            self._phase_indices.append(indices)
+            self._required.append(required)
+            # Default divisor: the largest product of the phase's metrics
+            with_optional = phase.get('divisor', int(self.max_metrics[indices].prod()))
+            if required.all():
+                without_optional = with_optional
+            else:
+                without_optional = phase.get('divisor_without_optional',
+                                             int(self.max_metrics[indices[required]].prod()))
+            divisors.append((with_optional, without_optional))
+        self._divisors = np.array(divisors, dtype=np.float64).T  # (variant, phase)
+        if (self._divisors <= 0).any():
+            raise FrameworkError(f"Framework '{self.name}': divisors must be positive")
+        self.weights = tuple(float(phase.get('weight', 1.0)) for phase in phases)
+        self.weight = float(np.prod(self.weights))
+        self._overall_divisor = overall.get('divisor')
+
+    def _compile_ranges(self, ranges, ranges_without_optional):
+        variants = {WITH_OPTIONAL: ranges, WITHOUT_OPTIONAL: ranges_without_optional or ranges}
+        self.classifier = CompiledRanges(variants)
+        missing = set(self.table_types) - set(self.classifier.table_types)
+        if missing:
+            raise FrameworkError(f"Framework '{self.name}' has no range table for "
+                                 f"{', '.join(sorted(missing))}")
+        self.categories = {
+            table_type: {band['level']: band['category'] for band in bands}
+            for table_type, bands in ranges.items()
+        }
+        if self._overall_divisor is None:
+            # Default: the largest product of the phase levels
+            self._overall_divisor = int(np.prod([max(self.categories[table_type])
+                                                 for table_type in self.table_types[:-2]]))
+        self.overall_divisor = float(self._overall_divisor)
+        # Classifier slot of every column, per variant (0: with, 1: without optional)
+        self._slots = np.array([
+            [self.classifier.slot(table_type, variant) for table_type in self.table_types]
+            for variant in (WITH_OPTIONAL, WITHOUT_OPTIONAL)
+        ])
+
+    def _compile_lookup(self):
+        """Precompute every complete selection, indexed by a mixed-radix code"""
+        # Required factors take the digits 0..max-1 (metric - 1), the optional one 0..max
+        self._offsets = np.ones(len(self.factor_columns), dtype=np.int64)
+        if self.optional_index is not None:
+            self._offsets[self.optional_index] = 0
+        radices = self.max_metrics + 1 - self._offsets
+        self._strides = np.concatenate(([1], np.cumprod(radices[:-1]))).astype(np.int64)
+        self.lookup_size = int(np.prod(radices, dtype=np.float64))
+        self._lookup = None
+        if self.lookup_size <= MAX_LOOKUP_SIZE:
+            codes = np.arange(self.lookup_size, dtype=np.int64).reshape(-1, 1)
+            metrics = (codes // self._strides) % radices + self._offsets
+            result = self.score_batch(metrics)
+            self._lookup = (result.scores, result.levels)
+
+    def as_metrics(self, metrics):
+        """
+        Normalise input to an (N x factors) int8 array with 0 for unselected factors
+
+        Raises:
+            ValueError: On a wrong shape or metrics outside a factor's range
+        """
+        return as_metrics_array(metrics, self.factor_columns, self.max_metrics)
+
+    def encode(self, metrics):
+        """Lookup code of each row, -1 when a required factor is not selected"""
+        digits = metrics.astype(np.int64) - self._offsets
+        complete = (digits >= 0).all(axis=1)
+        return np.where(complete, digits @ self._strides, -1)
+
+    def score_batch(self, metrics):
+        """
+        Score (N x factors) metrics step by step
+
+        Args:
+            metrics (array-like): Metrics in factor order, 0 for unselected
+
+        Returns:
+            PlanResult: Scores and levels of every column per row
+        """
+        metrics = self.as_metrics(metrics)
+        rows = len(metrics)
+        phases = len(self.phase_names)
+        if self.optional_index is None:
+            has_optional = np.ones(rows, dtype=bool)
+        else:
+            has_optional = metrics[:, self.optional_index] > 0
+        variant = np.where(has_optional, 0, 1)
+
+        scores = np.full((rows, len(self.columns)), np.nan)
+        for phase, (indices, required) in enumerate(zip(self._phase_indices, self._required)):
+            values = metrics[:, indices].astype(np.int64)
+            complete = (values[:, required] > 0).all(axis=1)
+            product = np.where(values > 0, values, 1).prod(axis=1)
+            scores[:, phase] = np.where(complete, product / self._divisors[variant, phase], np.nan)
+
+        slots = self._slots[variant]
+        levels = np.zeros((rows, len(self.columns)), dtype=np.int8)
+        levels[:, :phases] = self.classifier.classify_array(scores[:, :phases], slots[:, :phases],
+                                                            unranked=UNRANKED)
+        phase_levels = levels[:, :phases].astype(np.int64)
+        ranked = (phase_levels != UNRANKED).all(axis=1)
+        not_weighted = np.where(ranked, phase_levels.prod(axis=1) / self.overall_divisor, np.nan)
+        scores[:, phases] = not_weighted
+        scores[:, phases + 1] = not_weighted * self.weight
+        levels[:, phases:] = self.classifier.classify_array(scores[:, phases:], slots[:, phases:],
+                                                            unranked=UNRANKED)
+        return PlanResult(scores, levels, has_optional)
+
+    def lookup_batch(self, metrics):
+        """Score (N x factors) metrics from the lookup arrays (a drop-in for score_batch)"""
+        if self._lookup is None:
+            return self.score_batch(metrics)
+        metrics = self.as_metrics(metrics)
+        codes = self.encode(metrics)
+        complete = codes >= 0
+        lookup_scores, lookup_levels = self._lookup
+        scores = lookup_scores[np.where(complete, codes, 0)]
+        levels = lookup_levels[np.where(complete, codes, 0)]
+        if not complete.all():
+            fallback = self.score_batch(metrics[~complete])
+            scores[~complete] = fallback.scores
+            levels[~complete] = fallback.levels
+        if self.optional_index is None:
+            has_optional = np.ones(len(metrics), dtype=bool)
+        else:
+            has_optional = metrics[:, self.optional_index] > 0
+        return PlanResult(scores, levels, has_optional)
+
+    def result_rows(self, result):
+        """
+        Turn a PlanResult into one JSON-ready dict per row
+
+        Returns:
+            list: Column -> {'score', 'level', 'category'}, plus 'has_<optional key>'
+                when the framework has an optional factor
+        """
+        scores, levels = result.scores.tolist(), result.levels.tolist()
+        rows = []
+        for row_scores, row_levels, has_optional in zip(scores, levels, result.has_optional.tolist()):
+            row = {
+                column: {
+                    'score': None if score != score else score,  # NaN when missing
+                    'level': None if level == UNRANKED else level,
+                    'category': self.categories[table_type].get(level, ''),
+                }
+                for column, table_type, score, level in zip(self.columns, self.table_types,
+                                                            row_scores, row_levels)
+            }
+            if self.optional_index is not None:
+                row[f"has_{self.factor_keys[self.optional_index]}"] = has_optional
+            rows.append(row)
+        return rows
@@ -0,0 +1,295 @@
+"""
+Incremental recomputation of the derived dashboard values.
+
+The values derived from a selection form a small dependency graph:
+
+    factor metrics -> phase scores -> phase levels -> overall credibility level
+        -> Table 2 cell -> Table 2 value
+    Table 3 cell -> risk color -> Table 4 action
+
+``DependencyGraph`` memoizes every node. Setting the inputs bumps a
+revision; reading a node only recomputes it when one of its dependencies
+changed value since it was last computed, so a click that changes one
+factor recomputes that factor's phase and stops wherever a recomputed value
+comes out unchanged (e.g. a new phase score in the same ranking level).
+``describe`` lists every node with its value and whether it was recomputed
+in the current revision.
+"""
+
+from dataclasses import dataclass
+
+from scoring.engine import (
+    DEVELOPMENT_DIVISOR_NO_CODE,
+    DEVELOPMENT_DIVISOR_WITH_CODE,
+    FACTOR_COLUMNS,
+    OVERALL_DIVISOR,
+    SUPPORT_DIVISOR,
+    SUPPORT_WEIGHT,
+    USE_DIVISOR,
+    CredibilityResult,
+    calculate_score,
+    get_ranking_level,
+)
+from scoring.selection import MATRIX_TABLES
+
+# Table 4 category of each Table 3 risk color
+RISK_CATEGORIES = {'green': 'G', 'yellow': 'Y', 'red': 'R'}
+
+
+@dataclass(frozen=True)
+class NodeInfo:
+    """State of one graph node, as listed by DependencyGraph.describe"""
+    name: str
+    dependencies: tuple
+    value: object
+    is_input: bool
+    recomputed: bool
+    computations: int
+
+
+class _Node:
+    __slots__ = ('dependencies', 'compute', 'value', 'changed_at', 'computed_at',
+                 'verified_at', 'computations')
+
+    def __init__(self, dependencies, compute, value=None):
+        self.dependencies = dependencies
+        self.compute = compute
+        self.value = value
+        self.changed_at = 0
+        self.computed_at = -1
+        self.verified_at = -1
+        self.computations = 0
+
+
+class DependencyGraph:
+    """Memoized nodes recomputed only when an upstream value changes"""
+
+    def __init__(self):
+        self._nodes = {}
+        self._dependents = {}
+        self.revision = 0
+
+    def add_input(self, name, value=None):
+        """Add an input node with its initial value"""
+        self._add(name, _Node((), None, value))
+
+    def add_node(self, name, dependencies, compute):
+        """
+        Add a derived node
+
+        Args:
+            name (str): Node name
+            dependencies (sequence): Names of existing nodes passed to compute
+            compute (callable): Called with the dependency values, in order
+        """
+        unknown = [dependency for dependency in dependencies if dependency not in self._nodes]
+        if unknown:
+            raise ValueError(f"{name} depends on unknown nodes: {', '.join(unknown)}")
+        self._add(name, _Node(tuple(dependencies), compute))
+        for dependency in dependencies:
+            self._dependents[dependency].append(name)
+
+    def _add(self, name, node):
+        if name in self._nodes:
+            raise ValueError(f"Node {name} already exists")
+        self._nodes[name] = node
+        self._dependents[name] = []
+
+    def set_inputs(self, values):
+        """
+        Update input nodes
+
+        Args:
+            values (mapping): Input name -> new value
+
+        Returns:
+            set: Names of the inputs whose value changed (a new revision starts if any)
+        """
+        changed = {name for name, value in values.items() if self._input(name).value != value}
+        if changed:
+            self.revision += 1
+            for name in changed:
+                node = self._nodes[name]
+                node.value = values[name]
+                node.changed_at = self.revision
+        return changed
+
+    def _input(self, name):
+        node = self._nodes[name]
+        if node.compute is not None:
+            raise ValueError(f"{name} is a derived node, not an input")
+        return node
+
+    def get(self, name):
+        """Return the value of a node, recomputing it if an upstream value changed"""
+        node = self._nodes[name]
+        if node.verified_at == self.revision:
+            return node.value
+        if node.compute is not None:
+            values = [self.get(dependency) for dependency in node.dependencies]
+            if node.computations == 0 or any(self._nodes[dependency].changed_at > node.computed_at
+                                              for dependency in node.dependencies):
+                value = node.compute(*values)
+                if node.computations == 0 or value != node.value:
+                    node.value = value
+                    node.changed_at = self.revision
+                node.computed_at = self.revision
+                node.computations += 1
+        node.verified_at = self.revision
+        return node.value
+
+    def describe(self):
+        """
+        List every node in insertion (dependency) order
+
+        Returns:
+            list: NodeInfo per node, after bringing all nodes up to date
+        """
+        infos = []
+        for name, node in self._nodes.items():
+            value = self.get(name)
+            infos.append(NodeInfo(
+                name=name,
+                dependencies=node.dependencies,
+                value=value,
+                is_input=node.compute is None,
+                recomputed=node.compute is not None and node.computed_at == self.revision,
+                computations=node.computations,
+            ))
+        return infos
+
+
+def selection_inputs(selection):
+    """
+    Input values of a credibility graph for a selection
+
+    Args:
+        selection (SelectionState): Packed dashboard selection
+
+    Returns:
+        dict: Factor column -> metric (None when unselected) and '<table>_selection' -> cell
+    """
+    inputs = dict(zip(FACTOR_COLUMNS, selection.assessment.to_metrics()))
+    for table_id in MATRIX_TABLES:
+        inputs[f"{table_id}_selection"] = selection.matrix_cell(table_id)
+    return inputs
+
+
+def build_credibility_graph(table2, table3, table4):
+    """
+    Build the dependency graph of the values derived from a selection
+
+    Inputs are the nine FACTOR_COLUMNS metrics, the selected cells
+    'table2_selection', 'table3_selection' and 'table4_selection', and the
+    matrix table data 'table2', 'table3' and 'table4': setting a reloaded
+    table recomputes only the nodes reading it. Derived
+    nodes hold the phase scores and levels (RankingResult), the overall
+    credibility ('not_weighted', 'weighted'), the whole CredibilityResult
+    ('result'), the Table 2 cell with its M&S credibility column filled in
+    from the weighted level, the Table 3 risk color and the Table 4 action.
+
+    Args:
+        table2, table3, table4 (dict): Initial matrix table data (see data.table_data)
+
+    Returns:
+        DependencyGraph: Graph with the table inputs set and the selection inputs unset
+    """
+    graph = DependencyGraph()
+    for column in FACTOR_COLUMNS:
+        graph.add_input(column)
+    for table_id, table_data in zip(MATRIX_TABLES, (table2, table3, table4)):
+        graph.add_input(f"{table_id}_selection")
+        graph.add_input(table_id, table_data)
+
+    data_pedigree, validation, code_readiness, models, input_pedigree, uncertainty, \
+        sensitivity, history, process = FACTOR_COLUMNS
+
+    graph.add_node('has_code_readiness', [code_readiness], lambda code: code is not None)
+    graph.add_node('development_score', [data_pedigree, validation, code_readiness, models],
+                   _development_score)
+    graph.add_node('use_score', [input_pedigree, uncertainty, sensitivity],
+                   lambda *metrics: calculate_score(*metrics, divisor=USE_DIVISOR))
+    graph.add_node('support_score', [history, process],
+                   lambda *metrics: calculate_score(*metrics, divisor=SUPPORT_DIVISOR))
+    for phase, table_type in (('development', 'development'), ('use', 'use'),
+                              ('support', 'support_evidence')):
+        graph.add_node(phase, [f"{phase}_score", 'has_code_readiness'],
+                       lambda score, has_code, table_type=table_type:
+                       get_ranking_level(score, table_type, has_code))
+        # The overall score only depends on the level: a new score in the same level stops here
+        graph.add_node(f"{phase}_level", [phase], lambda ranking: ranking.level)
+
+    graph.add_node('not_weighted_score', ['development_level', 'use_level', 'support_level'],
+                   lambda *levels: calculate_score(*levels, divisor=OVERALL_DIVISOR))
+    graph.add_node('not_weighted', ['not_weighted_score', 'has_code_readiness'],
+                   lambda score, has_code: get_ranking_level(score, 'overall_credibility', has_code))
+    graph.add_node('weighted', ['not_weighted_score', 'has_code_readiness'],
+                   lambda score, has_code: get_ranking_level(score * SUPPORT_WEIGHT if score else None,
+                                                             'overall_credibility', has_code))
+    graph.add_node('result', ['development', 'use', 'support', 'not_weighted', 'weighted',
+                              'has_code_readiness'],
+                   lambda *values: CredibilityResult(*values))
+
+    graph.add_node('weighted_level', ['weighted'], lambda ranking: ranking.level)
+    graph.add_node('table2_cell', ['table2', 'weighted_level', 'table2_selection'], table2_cell)
+    graph.add_node('table2_value', ['table2', 'table2_cell'],
+                   lambda table, cell: None if cell is None else table['data'][cell[0]][cell[1]])
+    graph.add_node('risk_color', ['table3', 'table3_selection'],
+                   lambda table, cell: None if cell is None else table['data'][cell[0]][cell[1]])
+    graph.add_node('table4_action', ['table4', 'risk_color', 'table4_selection'], table4_action)
+    return graph
+
+
+def _development_score(data_pedigree, validation, code_readiness, models):
+    if code_readiness is not None:
+        return calculate_score(data_pedigree, validation, code_readiness, models,
+                               divisor=DEVELOPMENT_DIVISOR_WITH_CODE)
+    return calculate_score(data_pedigree, validation, models, divisor=DEVELOPMENT_DIVISOR_NO_CODE)
+
+
+def maturity_column(table2, level):
+    """
+    Table 2 M&S credibility / maturity column of an overall credibility level
+
+    Level 1 (highly credible results) is maturity 4, level 4 is maturity 1.
+
+    Returns:
+        int or None: Column index, None when the level is unknown
+    """
+    if level is None:
+        return None
+    return table2['col_labels'].index(str(len(table2['col_labels']) + 1 - level))
+
+
+def table2_cell(table2, level, cell):
+    """
+    Table 2 cell of a selected design solution row at the maturity of a credibility level
+
+    Args:
+        table2 (dict): Table 2 data
+        level (int or None): Weighted overall credibility level
+        cell (tuple or None): Selected (row_idx, col_idx); its column is
+            kept while the level is unknown
+
+    Returns:
+        tuple or None: (row_idx, col_idx)
+    """
+    col_idx = maturity_column(table2, level)
+    if cell is None or col_idx is None:
+        return cell
+    return (cell[0], col_idx)
+
+
+def table4_action(table4, color, cell):
+    """
+    Table 4 action for a Table 3 risk color in the column of the selected Table 4 cell
+
+    Returns:
+        tuple or None: (category, column name, action text); None without a risk
+            color or Table 4 column
+    """
+    if color is None or cell is None:
+        return None
+    category = RISK_CATEGORIES[color]
+    column = f"CC{cell[1] + 1}"
+    return category, column, table4[column][table4['categories'].index(category)]
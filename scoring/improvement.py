@@ -0,0 +1,168 @@
+"""
+Cheapest factor upgrades that reach a target credibility level.
+
+Starting from an assessment, a best-first (uniform cost) search raises one
+factor metric by one step at a time, each step costing the weight of its
+factor, until the overall credibility level reaches the target. Phase
+levels depend on a few factors only, so they are cached per phase on the
+sub-selection; most search states reuse them.
+"""
+
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+
+from scoring.batch import CODE_READINESS
+from scoring.engine import (
+    DEVELOPMENT_DIVISOR_NO_CODE,
+    DEVELOPMENT_DIVISOR_WITH_CODE,
+    FACTOR_COLUMNS,
+    LEVEL_CATEGORIES,
+    OVERALL_DIVISOR,
+    SUPPORT_DIVISOR,
+    SUPPORT_WEIGHT,
+    USE_DIVISOR,
+    Assessment,
+    calculate_score,
+    get_ranking_level,
+    score_assessment,
+)
+from scoring.whatif import FactorChange
+
+# Factor indices of each phase, with the range table that ranks it
+_PHASES = (
+    ("development", (0, 1, 2, 3)),
+    ("use", (4, 5, 6)),
+    ("support_evidence", (7, 8)),
+)
+_MAX_METRIC = 3
+
+
+@dataclass(frozen=True)
+class ImprovementPlan:
+    """Cheapest upgrades found by minimal_improvement"""
+    changes: tuple
+    cost: float
+    result: object
+    explored: int
+
+    @property
+    def label(self):
+        return ", ".join(change.label for change in self.changes)
+
+
+def resolve_target_level(target):
+    """
+    Return the overall credibility level of a target
+
+    Args:
+        target (int or str): Level 1-4 or its category, e.g. 'Credible results'
+
+    Returns:
+        int: The level
+    """
+    categories = LEVEL_CATEGORIES["overall_credibility"]
+    if isinstance(target, str):
+        for level, category in categories.items():
+            if category.lower() == target.strip().lower():
+                return level
+        raise ValueError(f"Unknown credibility level '{target}', expected one of {list(categories.values())}")
+    if target not in categories:
+        raise ValueError(f"Credibility level must be one of {sorted(categories)}, got {target}")
+    return int(target)
+
+
+@lru_cache(maxsize=None)
+def _phase_level(table_type, values, has_code):
+    """Ranking level of one phase from its factor metrics (cached per sub-selection)"""
+    if table_type == "development":
+        divisor = DEVELOPMENT_DIVISOR_WITH_CODE if has_code else DEVELOPMENT_DIVISOR_NO_CODE
+        values = tuple(value for value in values if value)
+    elif table_type == "use":
+        divisor = USE_DIVISOR
+    else:
+        divisor = SUPPORT_DIVISOR
+    return get_ranking_level(calculate_score(*values, divisor=divisor), table_type, has_code).level
+
+
+@lru_cache(maxsize=None)
+def _overall_level(phase_levels, has_code, weighted):
+    """Overall credibility level of three phase levels (cached)"""
+    score = calculate_score(*phase_levels, divisor=OVERALL_DIVISOR)
+    if score and weighted:
+        score *= SUPPORT_WEIGHT
+    return get_ranking_level(score, "overall_credibility", has_code).level
+
+
+def overall_level(metrics, weighted=True):
+    """Overall credibility level of nine metrics (0 = code readiness left out)"""
+    has_code = metrics[CODE_READINESS] > 0
+    phase_levels = tuple(
+        _phase_level(table_type, tuple(metrics[idx] for idx in factors), has_code)
+        for table_type, factors in _PHASES
+    )
+    return _overall_level(phase_levels, has_code, weighted)
+
+
+def minimal_improvement(assessment, target, costs=None, weighted=True):
+    """
+    Find the cheapest factor upgrades that reach a target overall credibility level
+
+    Args:
+        assessment (Assessment): Complete assessment (code readiness may be omitted,
+            it is then left out of the upgrades as well)
+        target (int or str): Overall credibility level 1-4 or its category; any
+            more credible level also satisfies it
+        costs (dict): Optional Table 1 column -> cost of raising its metric by one (default 1)
+        weighted (bool): Target the weighted (default) or non-weighted overall level
+
+    Returns:
+        ImprovementPlan or None: The cheapest upgrades (no changes when the target is
+            already met), None when even the best metrics cannot reach the target
+
+    Raises:
+        ValueError: If a required factor is not selected, a cost is negative or the
+            target is unknown
+    """
+    target_level = resolve_target_level(target)
+    start = tuple(value or 0 for value in assessment.to_metrics())
+    missing = [column for idx, (column, value) in enumerate(zip(FACTOR_COLUMNS, start))
+               if value == 0 and idx != CODE_READINESS]
+    if missing:
+        raise ValueError(f"Select a metric for {', '.join(missing)} first")
+
+    costs = costs or {}
+    unknown = set(costs) - set(FACTOR_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown factor columns: {', '.join(sorted(unknown))}")
+    step_costs = tuple(float(costs.get(column, 1.0)) for column in FACTOR_COLUMNS)
+    if any(cost < 0 for cost in step_costs):
+        raise ValueError("Upgrade costs must not be negative")
+    upgradable = [idx for idx, value in enumerate(start) if value]
+
+    # Uniform cost search: states leave the heap in order of total cost
+    heap = [(0.0, start)]
+    settled = set()
+    while heap:
+        cost, metrics = heapq.heappop(heap)
+        if metrics in settled:
+            continue
+        settled.add(metrics)
+        if overall_level(metrics, weighted) <= target_level:
+            return _plan(assessment, start, metrics, cost, len(settled))
+        for idx in upgradable:
+            if metrics[idx] < _MAX_METRIC:
+                upgraded = metrics[:idx] + (metrics[idx] + 1,) + metrics[idx + 1:]
+                if upgraded not in settled:
+                    heapq.heappush(heap, (cost + step_costs[idx], upgraded))
+    return None
+
+
+def _plan(assessment, start, metrics, cost, explored):
+    changes = tuple(
+        FactorChange(column, old or None, new or None)
+        for column, old, new in zip(FACTOR_COLUMNS, start, metrics)
+        if old != new
+    )
+    result = score_assessment(Assessment(*(value or None for value in metrics)))
+    return ImprovementPlan(changes=changes, cost=cost, result=result, explored=explored)
@@ -0,0 +1,195 @@
+"""
+Precomputed lookup table over the whole Table 1 selection space.
+
+Each of the nine factors has three metric levels and code readiness may be
+left out, so there are only 3^8 * 4 = 26,244 complete selections. The table
+stores every outcome of ``score_batch`` for them, indexed by a mixed-radix
+selection code, so scoring a complete selection is a single array lookup.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from scoring.batch import (
+    CODE_READINESS,
+    PHASE_TABLE_TYPES,
+    UNRANKED,
+    BatchResult,
+    as_metrics_array,
+    score_batch,
+)
+from scoring.engine import (
+    FACTOR_COLUMNS,
+    LEVEL_CATEGORIES,
+    Assessment,
+    CredibilityResult,
+    RankingResult,
+    score_assessment,
+)
+
+# Digits per factor: metric - 1 for required factors, metric (0 = omitted) for code readiness
+RADICES = tuple(4 if idx == CODE_READINESS else 3 for idx in range(len(FACTOR_COLUMNS)))
+TABLE_SIZE = int(np.prod(RADICES))
+
+# Place value of each factor digit, first factor most significant
+_PLACE_VALUES = np.array(
+    [int(np.prod(RADICES[idx + 1:])) for idx in range(len(RADICES))], dtype=np.int64
+)
+_DIGIT_OFFSETS = np.array([0 if idx == CODE_READINESS else 1 for idx in range(len(RADICES))],
+                          dtype=np.int64)
+
+
+def encode_batch(metrics):
+    """
+    Encode (N x 9) metrics into selection codes
+
+    Args:
+        metrics (array-like): (N x 9) metrics in FACTOR_COLUMNS order, 0 for unselected
+
+    Returns:
+        numpy.ndarray: int64 codes, -1 for rows missing a required factor
+    """
+    metrics = as_metrics_array(metrics).astype(np.int64)
+    digits = metrics - _DIGIT_OFFSETS
+    complete = (digits >= 0).all(axis=1) & (metrics <= 3).all(axis=1)
+    return np.where(complete, digits @ _PLACE_VALUES, -1)
+
+
+def encode_selection(assessment):
+    """
+    Encode one assessment into its selection code
+
+    Args:
+        assessment (Assessment): Selected factor metrics
+
+    Returns:
+        int or None: Selection code, None if a required factor is not selected
+    """
+    code = int(encode_batch([[value or 0 for value in assessment.to_metrics()]])[0])
+    return code if code >= 0 else None
+
+
+def decode_selection(code):
+    """
+    Decode a selection code back into an assessment
+
+    Args:
+        code (int): Selection code in range(TABLE_SIZE)
+
+    Returns:
+        Assessment: The encoded assessment
+    """
+    if not 0 <= code < TABLE_SIZE:
+        raise ValueError(f"Selection code {code} out of range(0, {TABLE_SIZE})")
+    metrics = []
+    for idx, place in enumerate(_PLACE_VALUES):
+        digit, code = divmod(code, int(place))
+        metrics.append(int(digit + _DIGIT_OFFSETS[idx]) or None)
+    return Assessment.from_metrics(metrics)
+
+
+def all_selections():
+    """Return the (TABLE_SIZE x 9) metrics array of every complete selection, in code order"""
+    codes = np.arange(TABLE_SIZE, dtype=np.int64)
+    digits = (codes[:, None] // _PLACE_VALUES) % np.array(RADICES, dtype=np.int64)
+    return (digits + _DIGIT_OFFSETS).astype(np.int8)
+
+
+class LookupTable:
+    """Every ``score_batch`` outcome of the selection space, indexed by selection code"""
+
+    def __init__(self):
+        result = score_batch(all_selections())
+        # One compact row per selection: 5 scores and 5 levels (0 = unranked)
+        self.scores = np.stack([getattr(result, f"{name}_score") for name, _ in PHASE_TABLE_TYPES], axis=1)
+        self.levels = np.stack([getattr(result, f"{name}_level") for name, _ in PHASE_TABLE_TYPES], axis=1)
+        self.scores.setflags(write=False)
+        self.levels.setflags(write=False)
+
+    def result(self, code):
+        """
+        Return the scoring result of one selection code
+
+        Args:
+            code (int): Selection code
+
+        Returns:
+            CredibilityResult: Same result as score_assessment for that selection
+        """
+        phases = {}
+        for idx, (name, table_type) in enumerate(PHASE_TABLE_TYPES):
+            score = float(self.scores[code, idx])
+            level = int(self.levels[code, idx])
+            if level == UNRANKED:
+                phases[name] = RankingResult(score=None if np.isnan(score) else score)
+            else:
+                phases[name] = RankingResult(score, level, LEVEL_CATEGORIES[table_type][level])
+        has_code = code // int(_PLACE_VALUES[CODE_READINESS]) % RADICES[CODE_READINESS] > 0
+        return CredibilityResult(has_code_readiness=bool(has_code), **phases)
+
+    def lookup_batch(self, metrics):
+        """
+        Score (N x 9) metrics by lookup, falling back to score_batch for incomplete rows
+
+        Args:
+            metrics (array-like): (N x 9) metrics in FACTOR_COLUMNS order, 0 for unselected
+
+        Returns:
+            BatchResult: Same arrays score_batch would return
+        """
+        metrics = as_metrics_array(metrics)
+        codes = encode_batch(metrics)
+        complete = codes >= 0
+        scores = self.scores[np.where(complete, codes, 0)]
+        levels = self.levels[np.where(complete, codes, 0)]
+
+        if not complete.all():
+            fallback = score_batch(metrics[~complete])
+            scores[~complete] = np.stack(
+                [getattr(fallback, f"{name}_score") for name, _ in PHASE_TABLE_TYPES], axis=1)
+            levels[~complete] = np.stack(
+                [getattr(fallback, f"{name}_level") for name, _ in PHASE_TABLE_TYPES], axis=1)
+
+        columns = {}
+        for idx, (name, _) in enumerate(PHASE_TABLE_TYPES):
+            columns[f"{name}_score"] = scores[:, idx]
+            columns[f"{name}_level"] = levels[:, idx]
+        return BatchResult(has_code_readiness=metrics[:, CODE_READINESS] > 0, **columns)
+
+
+@lru_cache(maxsize=1)
+def get_lookup_table():
+    """Build the lookup table once per process and share it afterwards"""
+    return LookupTable()
+
+
+def lookup_assessment(assessment):
+    """
+    Score an assessment by table lookup (score_assessment for partial selections)
+
+    Args:
+        assessment (Assessment): Selected factor metrics
+
+    Returns:
+        CredibilityResult: Phase scores, ranking levels and overall credibility
+    """
+    code = encode_selection(assessment)
+    if code is None:
+        return score_assessment(assessment)
+    return get_lookup_table().result(code)
+
+
+def verify_lookup_table(table=None):
+    """
+    Check every table entry against the step-by-step score_assessment path
+
+    Args:
+        table (LookupTable): Table to check, the shared table by default
+
+    Returns:
+        list: Selection codes whose lookup result differs (empty when consistent)
+    """
+    table = table or get_lookup_table()
+    return [code for code in range(TABLE_SIZE)
+            if table.result(code) != score_assessment(decode_selection(code))]
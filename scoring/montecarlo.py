@@ -0,0 +1,114 @@
+"""
+Monte Carlo propagation of uncertain factor ratings.
+
+Instead of a single metric per Table 1 factor, each factor gets a
+probability distribution over the metrics 1, 2 and 3. Assessments are
+sampled from these distributions with NumPy, scored through the lookup
+table, and the share of samples at each ranking level is reported for the
+phases and the overall credibility.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from scoring.batch import CODE_READINESS, PHASE_TABLE_TYPES
+from scoring.engine import FACTOR_COLUMNS
+from scoring.lookup import get_lookup_table
+
+METRICS = (1, 2, 3)
+LEVELS = (1, 2, 3, 4)
+DEFAULT_SAMPLES = 200_000
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """Share of samples at ranking levels 1-4, per phase and overall credibility"""
+    development: tuple
+    use: tuple
+    support: tuple
+    not_weighted: tuple
+    weighted: tuple
+    samples: int
+
+
+def normalise_distributions(distributions):
+    """
+    Validate per-factor weights and scale them to probabilities
+
+    Args:
+        distributions (sequence): Nine weight triples for the metrics 1, 2, 3 in
+            FACTOR_COLUMNS order; all-zero (or None) leaves code readiness out
+
+    Returns:
+        tuple: Nine probability triples, rounded so equal inputs give equal cache keys
+
+    Raises:
+        ValueError: On a wrong shape, negative weights or a required factor without weight
+    """
+    if len(distributions) != len(FACTOR_COLUMNS):
+        raise ValueError(f"Expected {len(FACTOR_COLUMNS)} distributions, got {len(distributions)}")
+    probabilities = []
+    for idx, (column, weights) in enumerate(zip(FACTOR_COLUMNS, distributions)):
+        weights = np.zeros(len(METRICS)) if weights is None else np.asarray(weights, dtype=float)
+        if weights.shape != (len(METRICS),) or (weights < 0).any() or not np.isfinite(weights).all():
+            raise ValueError(f"{column}: expected three non-negative weights for the metrics 1, 2, 3")
+        total = weights.sum()
+        if total == 0:
+            if idx != CODE_READINESS:
+                raise ValueError(f"{column}: at least one metric needs a positive weight")
+            probabilities.append((0.0,) * len(METRICS))
+            continue
+        probabilities.append(tuple(round(float(weight / total), 6) for weight in weights))
+    return tuple(probabilities)
+
+
+def sample_metrics(probabilities, samples, rng):
+    """
+    Draw (samples x 9) metrics from normalised per-factor distributions
+
+    Args:
+        probabilities (tuple): Output of normalise_distributions
+        samples (int): Number of assessments to draw
+        rng (numpy.random.Generator): Random number generator
+
+    Returns:
+        numpy.ndarray: int8 metrics, 0 for code readiness left out
+    """
+    metrics = np.zeros((samples, len(FACTOR_COLUMNS)), dtype=np.int8)
+    for idx, probs in enumerate(probabilities):
+        if not any(probs):
+            continue
+        cdf = np.cumsum(probs)
+        cdf[-1] = 1.0
+        metrics[:, idx] = np.searchsorted(cdf, rng.random(samples), side='right') + 1
+    return metrics
+
+
+def simulate(distributions, samples=DEFAULT_SAMPLES, seed=0):
+    """
+    Estimate the ranking level distributions of uncertain factor ratings
+
+    Results are cached per (normalised) input distribution, sample count and seed.
+
+    Args:
+        distributions (sequence): Nine weight triples, see normalise_distributions
+        samples (int): Number of sampled assessments
+        seed (int): Random seed, so equal inputs give equal estimates
+
+    Returns:
+        MonteCarloResult: Share of samples at each level
+    """
+    return _simulate(normalise_distributions(distributions), int(samples), int(seed))
+
+
+@lru_cache(maxsize=64)
+def _simulate(probabilities, samples, seed):
+    metrics = sample_metrics(probabilities, samples, np.random.default_rng(seed))
+    result = get_lookup_table().lookup_batch(metrics)
+    shares = {}
+    for name, _ in PHASE_TABLE_TYPES:
+        counts = np.bincount(getattr(result, f"{name}_level"), minlength=len(LEVELS) + 1)
+        shares[name] = tuple(float(count) / samples for count in counts[1:len(LEVELS) + 1])
+    return MonteCarloResult(samples=samples, **shares)
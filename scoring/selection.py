@@ -0,0 +1,271 @@
+"""
+Compact bit-packed encoding of the dashboard selection state.
+
+A complete selection is the metric level of each of the nine Table 1
+factors plus the selected cell of the Table 2, 3 and 4 matrices. It packs
+into a single non-negative integer of TOTAL_BITS bits:
+
+- factor ``i`` takes two bits at ``2 * i``: 0 when unselected, else the metric 1-3
+- matrix ``j`` takes CELL_BITS bits after the factors: 0 when no cell is
+  selected, else ``1 + row_idx * MATRIX_MAX_COLS + col_idx``
+
+The integer fits a SQLite INTEGER column, and ``SelectionState`` wraps it as
+a small immutable, hashable value usable as a cache key. ``to_token`` writes
+it as a short base-36 string for URLs (at most 7 characters).
+"""
+
+import numpy as np
+
+from scoring.engine import FACTOR_COLUMNS, Assessment
+
+FACTOR_BITS = 2
+MATRIX_TABLES = ("table2", "table3", "table4")
+MATRIX_MAX_COLS = 8
+CELL_BITS = 6
+MATRIX_MAX_ROWS = ((1 << CELL_BITS) - 1) // MATRIX_MAX_COLS
+
+_FACTOR_SHIFTS = tuple(FACTOR_BITS * idx for idx in range(len(FACTOR_COLUMNS)))
+_CELL_SHIFTS = tuple(
+    FACTOR_BITS * len(FACTOR_COLUMNS) + CELL_BITS * idx for idx in range(len(MATRIX_TABLES))
+)
+TOTAL_BITS = FACTOR_BITS * len(FACTOR_COLUMNS) + CELL_BITS * len(MATRIX_TABLES)
+FACTOR_MASK = (1 << (FACTOR_BITS * len(FACTOR_COLUMNS))) - 1
+
+_FACTOR_INDEX = {column: idx for idx, column in enumerate(FACTOR_COLUMNS)}
+_TABLE_INDEX = {table_id: idx for idx, table_id in enumerate(MATRIX_TABLES)}
+
+# Table 1 lists the metrics 1, 2, 3 top to bottom: row index = metric - 1
+_METRIC_LEVELS = (1, 2, 3)
+
+_TOKEN_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _check_metric(metric):
+    """Return a metric as an int 0-3 (0 = unselected)"""
+    metric = int(metric or 0)
+    if metric != 0 and metric not in _METRIC_LEVELS:
+        raise ValueError(f"Metric must be one of {_METRIC_LEVELS} or unselected, got {metric}")
+    return metric
+
+
+def _cell_value(cell):
+    """Encode a (row_idx, col_idx) cell (None when unselected) into its bit field value"""
+    if cell is None:
+        return 0
+    row_idx, col_idx = cell
+    if not (0 <= row_idx < MATRIX_MAX_ROWS and 0 <= col_idx < MATRIX_MAX_COLS):
+        raise ValueError(f"Matrix cell {cell} outside {MATRIX_MAX_ROWS} x {MATRIX_MAX_COLS}")
+    return 1 + row_idx * MATRIX_MAX_COLS + col_idx
+
+
+class SelectionState:
+    """Immutable selection of the nine factors and the three matrix cells, packed in one int"""
+
+    __slots__ = ('code',)
+
+    def __init__(self, code=0):
+        """
+        Args:
+            code (int): Packed selection code, 0 for an empty selection
+        """
+        code = int(code)
+        if not 0 <= code < (1 << TOTAL_BITS):
+            raise ValueError(f"Selection code {code} out of range(0, {1 << TOTAL_BITS})")
+        object.__setattr__(self, 'code', code)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, SelectionState):
+            return NotImplemented
+        return self.code == other.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __int__(self):
+        return self.code
+
+    def __repr__(self):
+        return f"{type(self).__name__}(metrics={self.metrics}, matrix_cells={self.matrix_cells})"
+
+    def __reduce__(self):
+        return (type(self), (self.code,))
+
+    @classmethod
+    def from_parts(cls, metrics=None, matrix_cells=None):
+        """
+        Pack factor metrics and matrix cells
+
+        Args:
+            metrics (sequence): Nine metrics in FACTOR_COLUMNS order (None/0 when unselected)
+            matrix_cells (dict): Table id -> (row_idx, col_idx) or None
+
+        Returns:
+            SelectionState: The packed selection
+        """
+        code = 0
+        if metrics is not None:
+            if len(metrics) != len(FACTOR_COLUMNS):
+                raise ValueError(f"Expected {len(FACTOR_COLUMNS)} metrics, got {len(metrics)}")
+            for shift, metric in zip(_FACTOR_SHIFTS, metrics):
+                code |= _check_metric(metric) << shift
+        for table_id, cell in (matrix_cells or {}).items():
+            code |= _cell_value(cell) << _CELL_SHIFTS[_TABLE_INDEX[table_id]]
+        return cls(code)
+
+    @classmethod
+    def from_token(cls, token):
+        """
+        Parse a token written by to_token
+
+        Args:
+            token (str): Base-36 selection code
+
+        Returns:
+            SelectionState: The decoded selection
+
+        Raises:
+            ValueError: If the token is not a valid selection code
+        """
+        token = token.strip().lower()
+        if not token or any(char not in _TOKEN_DIGITS for char in token):
+            raise ValueError(f"Invalid selection token {token!r}")
+        state = cls(int(token, 36))
+        # Reject codes with factor or cell fields no selection can produce
+        cls.from_parts(state.metrics, state.matrix_cells)
+        return state
+
+    @classmethod
+    def from_assessment(cls, assessment, matrix_cells=None):
+        """Pack an Assessment and optional matrix cells"""
+        return cls.from_parts(assessment.to_metrics(), matrix_cells)
+
+    @classmethod
+    def from_selected_cells(cls, selected_cells):
+        """
+        Pack the ``selected_cells`` session layout
+
+        Args:
+            selected_cells (dict): 'table1' -> column name -> row index, and
+                matrix table id -> {'selected_cell': (row_idx, col_idx)}
+
+        Returns:
+            SelectionState: The packed selection (non-factor columns are ignored)
+        """
+        rows = selected_cells.get('table1', {})
+        metrics = [
+            None if rows.get(column) is None else _METRIC_LEVELS[rows[column]]
+            for column in FACTOR_COLUMNS
+        ]
+        matrix_cells = {
+            table_id: selected_cells.get(table_id, {}).get('selected_cell')
+            for table_id in MATRIX_TABLES
+        }
+        return cls.from_parts(metrics, matrix_cells)
+
+    @classmethod
+    def from_summary_data(cls, summary_data, matrix_cells=None):
+        """Pack the ``summary_data`` session layout and optional matrix cells"""
+        return cls.from_assessment(Assessment.from_summary_data(summary_data), matrix_cells)
+
+    @property
+    def metrics(self):
+        """Nine metrics in FACTOR_COLUMNS order, 0 when unselected (one batch-array row)"""
+        return tuple((self.code >> shift) & 0b11 for shift in _FACTOR_SHIFTS)
+
+    @property
+    def factor_code(self):
+        """Bits of the nine factors only: equal for selections that score the same"""
+        return self.code & FACTOR_MASK
+
+    @property
+    def assessment(self):
+        """The factor metrics as an Assessment"""
+        return Assessment(*(metric or None for metric in self.metrics))
+
+    @property
+    def matrix_cells(self):
+        """Table id -> selected (row_idx, col_idx) or None"""
+        return {table_id: self.matrix_cell(table_id) for table_id in MATRIX_TABLES}
+
+    def factor_metric(self, column):
+        """Metric selected for a Table 1 column, None when unselected"""
+        return (self.code >> _FACTOR_SHIFTS[_FACTOR_INDEX[column]]) & 0b11 or None
+
+    def factor_row(self, column):
+        """Table 1 row index selected in a column, None when unselected or not a factor"""
+        if column not in _FACTOR_INDEX:
+            return None
+        metric = self.factor_metric(column)
+        return None if metric is None else _METRIC_LEVELS.index(metric)
+
+    def matrix_cell(self, table_id):
+        """Selected (row_idx, col_idx) of a matrix table, None when unselected"""
+        value = (self.code >> _CELL_SHIFTS[_TABLE_INDEX[table_id]]) & ((1 << CELL_BITS) - 1)
+        if value == 0:
+            return None
+        return divmod(value - 1, MATRIX_MAX_COLS)
+
+    def with_factor_row(self, column, row_idx):
+        """Return a copy with a Table 1 column set to a row index (None to clear it)"""
+        shift = _FACTOR_SHIFTS[_FACTOR_INDEX[column]]
+        metric = 0 if row_idx is None else _METRIC_LEVELS[row_idx]
+        return SelectionState((self.code & ~(0b11 << shift)) | (metric << shift))
+
+    def with_matrix_cell(self, table_id, cell):
+        """Return a copy with a matrix table set to a cell (None to clear it)"""
+        shift = _CELL_SHIFTS[_TABLE_INDEX[table_id]]
+        mask = ((1 << CELL_BITS) - 1) << shift
+        return SelectionState((self.code & ~mask) | (_cell_value(cell) << shift))
+
+    def to_token(self):
+        """Return the selection code as a short base-36 string (see from_token)"""
+        code, digits = self.code, []
+        while True:
+            code, digit = divmod(code, 36)
+            digits.append(_TOKEN_DIGITS[digit])
+            if code == 0:
+                return "".join(reversed(digits))
+
+    def to_selected_cells(self):
+        """Return the selection in the ``selected_cells`` session layout"""
+        selected_cells = {'table1': {column: self.factor_row(column) for column in FACTOR_COLUMNS}}
+        for table_id, cell in self.matrix_cells.items():
+            selected_cells[table_id] = {'selected_cell': cell}
+        return selected_cells
+
+    def to_summary_data(self):
+        """Return the factor metrics in the ``summary_data`` session layout"""
+        return self.assessment.to_summary_data()
+
+
+def pack_metrics(metrics):
+    """
+    Pack (N x 9) metrics into factor codes
+
+    Args:
+        metrics (array-like): (N x 9) metrics 0-3 in FACTOR_COLUMNS order
+
+    Returns:
+        numpy.ndarray: int64 codes (the factor bits of SelectionState.code)
+    """
+    metrics = np.asarray(metrics, dtype=np.int64).reshape(-1, len(FACTOR_COLUMNS))
+    if ((metrics < 0) | (metrics > 3)).any():
+        raise ValueError("Metrics must be 0 (unselected) or 1-3")
+    return (metrics << np.array(_FACTOR_SHIFTS, dtype=np.int64)).sum(axis=1)
+
+
+def unpack_metrics(codes):
+    """
+    Unpack selection codes into an (N x 9) metrics array
+
+    Args:
+        codes (array-like): SelectionState codes (matrix bits are ignored)
+
+    Returns:
+        numpy.ndarray: int8 metrics in FACTOR_COLUMNS order, 0 when unselected
+    """
+    codes = np.asarray(codes, dtype=np.int64).reshape(-1, 1)
+    return ((codes >> np.array(_FACTOR_SHIFTS, dtype=np.int64)) & 0b11).astype(np.int8)
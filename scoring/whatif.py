@@ -0,0 +1,144 @@
+"""
+What-if analysis of factor changes.
+
+Scores every assessment that differs from a given one in one or two Table 1
+factors in a single ``score_batch`` call, and reports the changes that move
+the Development, Use or Support ranking level or the (weighted) overall
+credibility level, most improving first.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations, product
+from typing import Optional
+
+import numpy as np
+
+from scoring.batch import CODE_READINESS, score_batch
+from scoring.engine import FACTOR_COLUMNS
+
+# Ranking levels compared by the analysis (for all of them 1 is the best level)
+LEVEL_FIELDS = ('development_level', 'use_level', 'support_level', 'weighted_level')
+
+# Metrics a factor can be changed to (0 leaves code readiness out)
+_FACTOR_OPTIONS = tuple((0, 1, 2, 3) if idx == CODE_READINESS else (1, 2, 3)
+                        for idx in range(len(FACTOR_COLUMNS)))
+
+
+@dataclass(frozen=True)
+class FactorChange:
+    """One Table 1 column changed from one metric to another (None = not selected)"""
+    column: str
+    old: Optional[int]
+    new: Optional[int]
+
+    @property
+    def label(self):
+        """e.g. 'Validation 1 → 2'"""
+        return f"{self.column} {self.old or '–'} → {self.new or '–'}"
+
+
+@dataclass(frozen=True)
+class WhatIfOutcome:
+    """Ranking levels after applying a set of factor changes"""
+    changes: tuple
+    development_level: int
+    use_level: int
+    support_level: int
+    weighted_level: int
+    overall_gain: int
+    phase_gain: int
+
+    @property
+    def label(self):
+        return ", ".join(change.label for change in self.changes)
+
+
+def ranking_levels(assessment):
+    """Return the LEVEL_FIELDS levels of an assessment as a tuple (0 when unranked)"""
+    result = score_batch([[value or 0 for value in assessment.to_metrics()]])
+    return tuple(int(getattr(result, name)[0]) for name in LEVEL_FIELDS)
+
+
+def candidate_metrics(metrics, max_changes=2):
+    """
+    Build every metrics row differing from metrics in 1 to max_changes factors
+
+    Args:
+        metrics (sequence): Nine metrics in FACTOR_COLUMNS order, 0 when unselected
+        max_changes (int): Largest number of factors changed at once
+
+    Returns:
+        tuple: ((N x 9) int8 candidate array, list of changed factor index tuples)
+    """
+    base = np.asarray(metrics, dtype=np.int8)
+    rows, changed = [], []
+    for count in range(1, max_changes + 1):
+        for factors in combinations(range(len(FACTOR_COLUMNS)), count):
+            options = [[value for value in _FACTOR_OPTIONS[idx] if value != base[idx]] for idx in factors]
+            for values in product(*options):
+                row = base.copy()
+                row[list(factors)] = values
+                rows.append(row)
+                changed.append(factors)
+    return np.array(rows, dtype=np.int8).reshape(-1, len(FACTOR_COLUMNS)), changed
+
+
+def what_if(assessment, max_changes=2, include_downgrades=False):
+    """
+    Rank the one- and two-factor changes of an assessment by their effect on ranking levels
+
+    Args:
+        assessment (Assessment): Complete assessment (code readiness may be omitted)
+        max_changes (int): Largest number of factors changed at once
+        include_downgrades (bool): Also report changes that lower the overall or a phase level
+
+    Returns:
+        list: WhatIfOutcome per change that moves at least one level, most improving first
+            (overall credibility gain, then phase level gain, then fewest changes). Double
+            changes with the same effect as one of their single changes are left out.
+
+    Raises:
+        ValueError: If a required factor is not selected
+    """
+    metrics = [value or 0 for value in assessment.to_metrics()]
+    missing = [column for idx, (column, value) in enumerate(zip(FACTOR_COLUMNS, metrics))
+               if value == 0 and idx != CODE_READINESS]
+    if missing:
+        raise ValueError(f"Select a metric for {', '.join(missing)} first")
+
+    base_levels = np.array(ranking_levels(assessment))
+    candidates, changed = candidate_metrics(metrics, max_changes)
+    result = score_batch(candidates)
+    levels = np.stack([getattr(result, name) for name in LEVEL_FIELDS], axis=1)
+
+    # Level 1 is best for every ranking: a positive gain is an improvement
+    gains = base_levels - levels
+    moved = (gains != 0).any(axis=1)
+    if not include_downgrades:
+        moved &= (gains >= 0).all(axis=1)
+    overall_gain = gains[:, -1]
+    phase_gain = gains[:, :-1].sum(axis=1)
+    sizes = np.array([len(factors) for factors in changed])
+
+    # A double change whose effect one of its single changes already has adds nothing
+    single_levels = {
+        (factors[0], int(candidates[idx, factors[0]])): tuple(levels[idx])
+        for idx, factors in enumerate(changed) if len(factors) == 1
+    }
+    for idx in np.flatnonzero(moved & (sizes > 1)):
+        if any(single_levels.get((factor, int(candidates[idx, factor]))) == tuple(levels[idx])
+               for factor in changed[idx]):
+            moved[idx] = False
+
+    indices = np.flatnonzero(moved)
+    order = np.lexsort((sizes[indices], -phase_gain[indices], -overall_gain[indices]))
+    outcomes = []
+    for idx in indices[order]:
+        changes = tuple(
+            FactorChange(FACTOR_COLUMNS[factor], metrics[factor] or None, int(candidates[idx, factor]) or None)
+            for factor in changed[idx]
+        )
+        outcomes.append(WhatIfOutcome(changes, *(int(level) for level in levels[idx]),
+                                      overall_gain=int(overall_gain[idx]),
+                                      phase_gain=int(phase_gain[idx])))
+    return outcomes
@@ -0,0 +1,431 @@
+"""
+HTTP scoring service for tools without a browser.
+
+Serves the dashboard scoring rules as JSON over HTTP with asyncio and the
+standard library only. Concurrent score requests are merged into
+micro-batches: assessments that arrive while the event loop is busy are
+scored together in one vectorized lookup.
+
+    python scoring_service.py --port 8502
+    curl -d '{"metrics": {"Data Pedigree": 3, "Validation": 2, "Models": 3,
+              "Input pedigree": 2, "Uncertainty": 2, "Sensitivity": 1,
+              "History": 3, "Process development": 2}}' localhost:8502/score
+
+Endpoints:
+
+- ``POST /score``: ``{"metrics": ...}`` scores one assessment,
+  ``{"assessments": [...]}`` several. Metrics are an object keyed by Table 1
+  column or field name (e.g. ``data_pedigree``), or a list of nine values in
+  Table 1 order, with the metric 1-3 or null/0 for an unselected factor.
+  Each result holds the score, level and category of the Development, Use
+  and Support phases and of the not weighted and weighted credibility, as
+  in the dashboard summary tables. An optional ``"framework": "<name>"``
+  scores with another assessment framework of ``data/frameworks``
+  (factors, phases and levels as that framework defines them).
+- ``POST /matrices``: looks up selected ``[row_idx, col_idx]`` cells of
+  ``table2`` (design solution value), ``table3`` (risk color) and
+  ``table4`` (action). An optional ``credibility_level`` fills in the
+  Table 2 M&S credibility column as the dashboard does. With a Table 3 and a
+  Table 4 cell the response also holds the action recommended for the risk color.
+- ``GET /frameworks``: the available frameworks with their factors and hash.
+- ``GET /health`` and ``GET /stats`` (request and batch counters).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+
+import numpy as np
+
+from data.frameworks import DEFAULT_FRAMEWORK, get_scoring_plan, list_frameworks
+from data.table_data import check_matrix_cell, get_table_data
+from scoring.engine import LEVEL_CATEGORIES
+from scoring.framework import FrameworkError
+from scoring.graph import table2_cell, table4_action
+
+MAX_BODY_BYTES = 1 << 20
+MAX_ASSESSMENTS = 10_000
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """Invalid request, answered with an HTTP error status"""
+
+    def __init__(self, message, status=400, framing=False):
+        """
+        Args:
+            message (str): Error message sent to the client
+            status (int): HTTP status
+            framing (bool): The request body could not be delimited, so the connection is closed
+        """
+        super().__init__(message)
+        self.status = status
+        self.framing = framing
+
+
+def parse_metrics(value, plan):
+    """
+    Convert one JSON assessment to a metrics row
+
+    Args:
+        value (dict or list): Factor column or key -> metric, or one metric per factor in order
+        plan (ScoringPlan): Framework the metrics belong to
+
+    Returns:
+        tuple: One metric per factor (0 when unselected)
+
+    Raises:
+        RequestError: On unknown factors or metrics outside a factor's range
+    """
+    columns = plan.factor_columns
+    metrics = [0] * len(columns)
+    if isinstance(value, dict):
+        unknown = [key for key in value if key not in plan.column_index]
+        if unknown:
+            raise RequestError(f"Unknown factors: {', '.join(unknown)}")
+        items = [(plan.column_index[key], metric) for key, metric in value.items()]
+    elif isinstance(value, list) and len(value) == len(columns):
+        items = list(enumerate(value))
+    else:
+        raise RequestError(f"Metrics must be an object or a list of {len(columns)} values")
+    for idx, metric in items:
+        if metric is None or metric == 0:
+            continue
+        if isinstance(metric, bool) or not isinstance(metric, (int, float)) \
+                or (isinstance(metric, float) and not math.isfinite(metric)) \
+                or metric != int(metric) or not 1 <= metric <= plan.max_metrics[idx]:
+            raise RequestError(f"{columns[idx]}: metric must be 1-{plan.max_metrics[idx]} or null, "
+                               f"got {metric!r}")
+        metrics[idx] = int(metric)
+    return tuple(metrics)
+
+
+class MicroBatcher:
+    """
+    Merge concurrent scoring requests into one vectorized call
+
+    Requests queued while the event loop handles other work are scored
+    together: the batch is flushed once the loop gets idle (after max_delay
+    seconds when set), or as soon as max_batch assessments are waiting.
+    """
+
+    def __init__(self, max_batch=4096, max_delay=0.0):
+        """
+        Args:
+            max_batch (int): Assessments that trigger an immediate flush
+            max_delay (float): Seconds to wait for more requests (0: next loop iteration)
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []  # (plan, metrics rows, future)
+        self._pending_rows = 0
+        self._handle = None
+        self.batches = 0
+        self.scored = 0
+
+    async def score(self, plan, rows):
+        """Score a list of metrics rows with a plan, returns one result dict per row"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((plan, rows, future))
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.max_batch:
+            self._flush()
+        elif self._handle is None:
+            self._handle = (loop.call_later(self.max_delay, self._flush) if self.max_delay
+                            else loop.call_soon(self._flush))
+        return await future
+
+    def _flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending, self._pending_rows = self._pending, [], 0
+        by_plan = {}
+        for plan, rows, future in pending:
+            by_plan.setdefault(plan.hash, (plan, []))[1].append((rows, future))
+        for plan, requests in by_plan.values():
+            self._score_batch(plan, requests)
+
+    def _score_batch(self, plan, requests):
+        """Score the rows of all requests for one plan in a single lookup"""
+        metrics = np.array([row for rows, _ in requests for row in rows], dtype=np.int8)
+        try:
+            results = plan.result_rows(plan.lookup_batch(metrics))
+        except Exception as error:  # fail the waiting requests, keep serving
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.batches += 1
+        self.scored += len(metrics)
+        start = 0
+        for rows, future in requests:
+            if not future.done():
+                future.set_result(results[start:start + len(rows)])
+            start += len(rows)
+
+
+def lookup_matrices(request):
+    """
+    Look up the selected Table 2, 3 and 4 cells of a /matrices request
+
+    Returns:
+        dict: Per table the cell and its value, color or action
+    """
+    response = {}
+    cells = {table_id: _cell(request, table_id) for table_id in ('table2', 'table3', 'table4')}
+
+    if cells['table2'] is not None:
+        table2 = get_table_data('table2')
+        level = request.get('credibility_level')
+        levels = LEVEL_CATEGORIES['overall_credibility']
+        if level is not None and (isinstance(level, bool) or not isinstance(level, int) or level not in levels):
+            raise RequestError(f"credibility_level must be one of {', '.join(map(str, sorted(levels)))} "
+                               f"or null, got {level!r}")
+        row_idx, col_idx = table2_cell(table2, level, cells['table2'])
+        response['table2'] = {
+            'cell': [row_idx, col_idx],
+            'design_solution': table2['row_labels'][row_idx],
+            'credibility': table2['col_labels'][col_idx],
+            'value': table2['data'][row_idx][col_idx],
+        }
+    color = None
+    if cells['table3'] is not None:
+        table3 = get_table_data('table3')
+        row_idx, col_idx = cells['table3']
+        color = table3['data'][row_idx][col_idx]
+        response['table3'] = {
+            'cell': [row_idx, col_idx],
+            'decision_consequence': table3['row_labels'][row_idx],
+            'simulation_influence': table3['col_labels'][col_idx],
+            'color': color,
+        }
+    if cells['table4'] is not None:
+        table4 = get_table_data('table4')
+        row_idx, col_idx = cells['table4']
+        column = f"CC{col_idx + 1}"
+        response['table4'] = {
+            'cell': [row_idx, col_idx],
+            'category': table4['categories'][row_idx],
+            'column': column,
+            'action': table4[column][row_idx],
+        }
+        recommended = table4_action(table4, color, cells['table4'])
+        if recommended is not None:
+            category, column, action = recommended
+            response['recommended_action'] = {'category': category, 'column': column, 'action': action}
+    return response
+
+
+def _cell(request, table_id):
+    """Validated [row_idx, col_idx] of a table in a request, None when absent"""
+    cell = request.get(table_id)
+    if cell is None:
+        return None
+    try:
+        return check_matrix_cell(table_id, cell)
+    except ValueError as error:
+        raise RequestError(str(error))
+
+
+class ScoringService:
+    """Routes of the scoring service"""
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.requests = 0
+
+    async def handle(self, method, path, body):
+        """
+        Answer one request
+
+        Returns:
+            tuple: (HTTP status, JSON-ready response)
+        """
+        self.requests += 1
+        routes = {
+            ('GET', '/health'): self._health,
+            ('GET', '/stats'): self._stats,
+            ('GET', '/frameworks'): self._frameworks,
+            ('POST', '/score'): self._score,
+            ('POST', '/matrices'): self._matrices,
+        }
+        route = routes.get((method, path))
+        if route is None:
+            if any(route_path == path for _, route_path in routes):
+                raise RequestError(f"{method} is not allowed on {path}", status=405)
+            raise RequestError(f"No endpoint {path}", status=404)
+        return 200, await route(body)
+
+    async def _health(self, body):
+        return {'status': 'ok'}
+
+    async def _stats(self, body):
+        return {
+            'requests': self.requests,
+            'batches': self.batcher.batches,
+            'scored': self.batcher.scored,
+            'mean_batch_size': self.batcher.scored / self.batcher.batches if self.batcher.batches else 0,
+        }
+
+    async def _frameworks(self, body):
+        frameworks = []
+        for name in list_frameworks():
+            try:
+                plan = get_scoring_plan(name)
+            except FrameworkError as error:
+                frameworks.append({'name': name, 'error': str(error)})
+                continue
+            frameworks.append({
+                'name': name,
+                'hash': plan.hash,
+                'factors': [{'column': column, 'key': key, 'metrics': int(metrics)}
+                            for column, key, metrics in zip(plan.factor_columns, plan.factor_keys,
+                                                            plan.max_metrics)],
+                'columns': list(plan.columns),
+            })
+        return {'frameworks': frameworks}
+
+    async def _score(self, body):
+        request = _json_object(body)
+        framework = request.get('framework', DEFAULT_FRAMEWORK)
+        try:
+            plan = get_scoring_plan(framework if isinstance(framework, str) else '')
+        except FrameworkError as error:
+            raise RequestError(str(error))
+        if 'metrics' in request:
+            return (await self.batcher.score(plan, [parse_metrics(request['metrics'], plan)]))[0]
+        assessments = request.get('assessments')
+        if not isinstance(assessments, list) or not assessments:
+            raise RequestError("Expected 'metrics' or a non-empty 'assessments' list")
+        if len(assessments) > MAX_ASSESSMENTS:
+            raise RequestError(f"At most {MAX_ASSESSMENTS} assessments per request", status=413)
+        return {'results': await self.batcher.score(plan, [parse_metrics(value, plan)
+                                                           for value in assessments])}
+
+    async def _matrices(self, body):
+        return lookup_matrices(_json_object(body))
+
+
+def _content_length(headers):
+    """
+    Parse the Content-Length header
+
+    Raises:
+        RequestError: 400 for a missing number or a negative one, 413 above MAX_BODY_BYTES
+    """
+    value = headers.get('content-length') or '0'
+    if not (value.isascii() and value.isdigit()):  # also rejects signs
+        raise RequestError(f"Invalid Content-Length {value!r}", framing=True)
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(f"Request body exceeds {MAX_BODY_BYTES} bytes", status=413, framing=True)
+    return length
+
+
+def _json_object(body):
+    try:
+        request = json.loads(body or b'{}')
+    except ValueError:
+        raise RequestError("Request body is not valid JSON")
+    if not isinstance(request, dict):
+        raise RequestError("Request body must be a JSON object")
+    return request
+
+
+async def serve_connection(service, reader, writer):
+    """Answer HTTP/1.1 requests of one (keep-alive) connection"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = (headers.get('connection', '').lower() != 'close'
+                          and version == 'HTTP/1.1')
+            try:
+                length = _content_length(headers)
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await service.handle(method, target.split('?', 1)[0], body)
+            except RequestError as error:
+                status, payload = error.status, {'error': str(error)}
+                if error.framing:
+                    keep_alive = False  # the body was not read: the connection cannot be reused
+            except asyncio.IncompleteReadError:
+                raise  # the client went away in the middle of the body
+            except Exception as error:
+                status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+
+            data = json.dumps(payload).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_service(host, port, max_batch=4096, max_delay=0.0, ready=None):
+    """
+    Run the service until cancelled
+
+    Args:
+        host (str): Interface to listen on
+        port (int): TCP port (0 picks a free one)
+        max_batch (int): Assessments that trigger an immediate batch flush
+        max_delay (float): Seconds to wait for more requests before scoring a batch
+        ready (callable): Called with the bound port once the server listens
+    """
+    get_scoring_plan(DEFAULT_FRAMEWORK)  # compile the default plan before the first request
+    service = ScoringService(MicroBatcher(max_batch=max_batch, max_delay=max_delay))
+    server = await asyncio.start_server(lambda reader, writer: serve_connection(service, reader, writer),
+                                        host, port, backlog=1024)
+    bound_port = server.sockets[0].getsockname()[1]
+    if ready is not None:
+        ready(bound_port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve credibility scoring over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--max-batch', type=int, default=4096,
+                        help="Assessments that trigger an immediate batch (default: 4096)")
+    parser.add_argument('--batch-delay-ms', type=float, default=0.0,
+                        help="Wait this long for more requests before scoring a batch "
+                             "(default: 0, score what arrived by the next event loop iteration)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(run_service(args.host, args.port, args.max_batch, args.batch_delay_ms / 1000,
+                                ready=lambda port: print(f"Scoring service listening on "
+                                                         f"http://{args.host}:{port}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()